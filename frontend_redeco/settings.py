@@ -26,6 +26,10 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    # Compress HTML/JSON responses (static files are pre-compressed by WhiteNoise);
+    # placed above ConditionalGet so the ETag is computed on the uncompressed body
+    'django.middleware.gzip.GZipMiddleware',
+    'django.middleware.http.ConditionalGetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -67,14 +71,32 @@ DATABASES = {
     )
 }
 
-# Session configuration - use cache/memory instead of database
-SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'redeco-cache',
+# Session configuration - reads are served from the cache; writes also go to the
+# database so a session survives cache eviction or a worker without it in memory
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'default'
+SESSION_SAVE_EVERY_REQUEST = False
+# Flash messages (clientes CRUD) travel in a signed cookie, not the session
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+# Use Redis (via REDIS_URL env var) so cached catalogs, tokens and sessions are
+# shared by all gunicorn workers; fall back to per-process memory for local dev
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
     }
-}
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'redeco-cache',
+        }
+    }
+# cache_page (per-view page cache) stores rendered pages in the same backend
+CACHE_MIDDLEWARE_ALIAS = 'default'
 
 # Internationalization
 LANGUAGE_CODE = 'es-mx'
@@ -90,6 +112,11 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Reject request bodies over 1 MB before parsing them (templates/400.html explains why)
+MAX_PAYLOAD_BYTES = 1_000_000
+DATA_UPLOAD_MAX_MEMORY_SIZE = MAX_PAYLOAD_BYTES
+DATA_UPLOAD_MAX_NUMBER_FIELDS = 200
+
 # REDECO API configuration (can be overridden with environment variable)
 REDECO_API_BASE = os.environ.get('REDECO_API_BASE', 'https://api.condusef.gob.mx')
 # REUNE API configuration (separate host)
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.11 on 2026-10-15 21:21
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('redeco_frontend', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cliente',
+            name='codigo_postal',
+            field=models.CharField(db_index=True, max_length=5, validators=[django.core.validators.RegexValidator('^\\d{5}$', 'El código postal debe tener 5 dígitos.')], verbose_name='Código Postal'),
+        ),
+        migrations.AlterField(
+            model_name='cliente',
+            name='tipo_persona',
+            field=models.IntegerField(choices=[(1, 'Persona Física'), (2, 'Persona Moral')], db_index=True, verbose_name='Tipo de persona'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['estado_id', 'codigo_postal'], name='cliente_estado_cp_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='cliente',
+            constraint=models.CheckConstraint(check=models.Q(('edad__isnull', True), ('edad__range', (0, 999)), _connector='OR'), name='cliente_edad_range', violation_error_message='La edad debe estar entre 0 y 999.'),
+        ),
+        migrations.AddConstraint(
+            model_name='cliente',
+            constraint=models.CheckConstraint(check=models.Q(('tipo_persona', 2), models.Q(models.Q(('sexo__isnull', False), models.Q(('sexo', ''), _negated=True)), ('edad__isnull', False), _connector='OR'), _negated=True), name='cliente_moral_no_sexo_edad', violation_error_message='Las personas morales no pueden tener sexo o edad.'),
+        ),
+    ]
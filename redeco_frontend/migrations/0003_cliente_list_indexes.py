@@ -0,0 +1,21 @@
+# Generated by Django 4.2.11 on 2026-10-15 21:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('redeco_frontend', '0002_cliente_indexes_constraints'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['municipio_id'], name='cliente_municipio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['nombre'], name='cliente_nombre_idx'),
+        ),
+    ]
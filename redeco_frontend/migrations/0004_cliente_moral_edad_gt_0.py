@@ -0,0 +1,21 @@
+# Generated by Django 4.2.11 on 2026-10-15 21:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('redeco_frontend', '0003_cliente_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='cliente',
+            name='cliente_moral_no_sexo_edad',
+        ),
+        migrations.AddConstraint(
+            model_name='cliente',
+            constraint=models.CheckConstraint(check=models.Q(('tipo_persona', 2), models.Q(models.Q(('sexo__isnull', False), models.Q(('sexo', ''), _negated=True)), ('edad__gt', 0), _connector='OR'), _negated=True), name='cliente_moral_no_sexo_edad', violation_error_message='Las personas morales no pueden tener sexo o edad.'),
+        ),
+    ]
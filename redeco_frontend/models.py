@@ -1,4 +1,6 @@
+from django.core.validators import RegexValidator
 from django.db import models
+from django.db.models import Q
 
 
 class Cliente(models.Model):
@@ -17,12 +19,23 @@ class Cliente(models.Model):
     # Campos principales
     nombre = models.CharField(max_length=255, verbose_name='Nombre del cliente')
     rfc = models.CharField(max_length=13, unique=True, verbose_name='RFC')
-    tipo_persona = models.IntegerField(choices=TIPO_PERSONA_CHOICES, verbose_name='Tipo de persona')
+    tipo_persona = models.IntegerField(choices=TIPO_PERSONA_CHOICES, verbose_name='Tipo de persona', db_index=True)
     
     # Datos geográficos
+    # Los nombres de estado/municipio/colonia se guardan desnormalizados junto a
+    # su ID de SEPOMEX: el listado de clientes (lectura frecuente) los muestra sin
+    # JOINs ni consultas por fila. El costo es que pueden quedar desactualizados
+    # si SEPOMEX renombra algo. Si algún día se normalizan como ForeignKey,
+    # agregarlos a CLIENTE_FK_FIELDS en views.py para que clientes_list use
+    # select_related() y no caiga en N+1.
     estado_id = models.IntegerField(verbose_name='Entidad Federativa (ID)')
     estado_nombre = models.CharField(max_length=100, verbose_name='Entidad Federativa', blank=True)
-    codigo_postal = models.CharField(max_length=5, verbose_name='Código Postal')
+    codigo_postal = models.CharField(
+        max_length=5,
+        verbose_name='Código Postal',
+        db_index=True,
+        validators=[RegexValidator(r'^\d{5}$', 'El código postal debe tener 5 dígitos.')],
+    )
     municipio_id = models.IntegerField(verbose_name='Municipio (ID)', null=True, blank=True)
     municipio_nombre = models.CharField(max_length=100, verbose_name='Municipio', blank=True)
     colonia_id = models.IntegerField(verbose_name='Colonia (ID)', null=True, blank=True)
@@ -41,24 +54,27 @@ class Cliente(models.Model):
         verbose_name = 'Cliente'
         verbose_name_plural = 'Clientes'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['estado_id', 'codigo_postal'], name='cliente_estado_cp_idx'),
+            # Filtro por municipio y orden por nombre de clientes_list (rfc ya
+            # tiene el índice de unique=True)
+            models.Index(fields=['municipio_id'], name='cliente_municipio_idx'),
+            models.Index(fields=['nombre'], name='cliente_nombre_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=Q(edad__isnull=True) | Q(edad__range=(0, 999)),
+                name='cliente_edad_range',
+                violation_error_message='La edad debe estar entre 0 y 999.',
+            ),
+            # Si es persona física (1), sexo y edad son opcionales pero comunes
+            # Si es persona moral (2), sexo y edad deben estar vacíos
+            models.CheckConstraint(
+                check=~(Q(tipo_persona=2) & ((Q(sexo__isnull=False) & ~Q(sexo='')) | Q(edad__gt=0))),
+                name='cliente_moral_no_sexo_edad',
+                violation_error_message='Las personas morales no pueden tener sexo o edad.',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.nombre} - {self.rfc}"
-    
-    def clean(self):
-        """Validaciones personalizadas."""
-        from django.core.exceptions import ValidationError
-        
-        # Si es persona física (1), sexo y edad son opcionales pero comunes
-        # Si es persona moral (2), sexo y edad deben estar vacíos
-        if self.tipo_persona == 2:
-            if self.sexo or self.edad:
-                raise ValidationError('Las personas morales no pueden tener sexo o edad.')
-        
-        # Validar edad máximo 3 dígitos
-        if self.edad is not None and (self.edad < 0 or self.edad > 999):
-            raise ValidationError('La edad debe estar entre 0 y 999.')
-        
-        # Validar formato de CP (5 dígitos)
-        if self.codigo_postal and (len(self.codigo_postal) != 5 or not self.codigo_postal.isdigit()):
-            raise ValidationError('El código postal debe tener 5 dígitos.')
@@ -1,67 +1,275 @@
+import base64
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+import orjson
 import requests
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlencode
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .models import Cliente
 
 
 class RedeCoAPIError(Exception):
     pass
 
 
+# Shared HTTP session so connections to the REDECO/REUNE hosts are kept alive
+# and reused between calls instead of paying a new TCP+TLS handshake each time.
+# Transient gateway errors are retried in-process with exponential backoff
+# (honouring Retry-After); once retries are exhausted the last response is
+# handed back so the status handling below still produces a friendly message.
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(502, 503, 504),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+# REUNE consultas/general is a POST; it is retried only when the request
+# provably never reached REUNE: connect errors and 502/503 from the gateway. A
+# 504 or a read timeout may come after REUNE stored the consulta, so those are
+# not retried (read=0). REDECO quejas POSTs keep the default (idempotent methods
+# only) so a queja is never submitted twice.
+_REUNE_CONSULTA_RETRY = _RETRY.new(
+    allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {'POST'},
+    status_forcelist=(502, 503),
+    read=0,
+    other=0,
+)
+
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=_RETRY))
+# requests picks the adapter with the longest matching prefix, so only this
+# endpoint gets the POST retries; the rest of REUNE uses the default policy
+_SESSION.mount(
+    getattr(settings, 'REUNE_API_BASE', 'https://api-reune.condusef.gob.mx').rstrip('/') + '/reune/consultas/general',
+    HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=_REUNE_CONSULTA_RETRY),
+)
+
+# Shape of a JWT (header.payload.signature, base64url segments)
+_JWT_RE = re.compile(r'^[A-Za-z0-9_\-]+\.[A-Za-z0-9_\-]+\.[A-Za-z0-9_\-]+$')
+
+# Tokens are reused until shortly before the JWT 'exp' claim
+TOKEN_CACHE_MARGIN = 30
+
+# Rows per INSERT statement for bulk Cliente imports
+CLIENTE_BULK_BATCH_SIZE = 500
+
+# Worker threads shared by all views to overlap independent upstream calls
+# (e.g. the estados dropdown plus the actual lookup) over the pooled session.
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='redeco-api')
+
+# Public catalogs change on the order of months, so their responses are kept in
+# Django's cache instead of being requested again on every page render. Fixed
+# catalogs (estados, medios, niveles) get the longest lifetime; per-estado/CP
+# sepomex lookups use the shorter default.
+PUBLIC_CATALOG_CACHE_TIMEOUT = 3600
+STATIC_CATALOG_CACHE_TIMEOUT = 86400
+# Protected catalogs (products-list, causas-list) are cached per token
+PROTECTED_CATALOG_CACHE_TIMEOUT = 900
+# Normalized medios/niveles/estados lists for the queja form (get_form_catalogs)
+FORM_CATALOGS_CACHE_KEY = 'redeco:form_catalogs'
+# Once stale, an entry is kept this long: with an ETag, a conditional GET
+# answered with 304 renews it without re-downloading the body, and if REDECO is
+# failing the stale body is served instead of an error. While serving stale,
+# the upstream is retried at most every PUBLIC_CATALOG_STALE_RETRY seconds.
+PUBLIC_CATALOG_REVALIDATE_TIMEOUT = 7 * 86400
+PUBLIC_CATALOG_STALE_RETRY = 60
+
+# In-process copy of the hottest public catalogs in front of Django's cache, so
+# repeated lookups (estados backs most dropdowns) skip the Redis round-trip and
+# unpickling. Bodies are shared between requests and must not be mutated.
+PUBLIC_CATALOG_L1_TIMEOUT = 300
+PUBLIC_CATALOG_L1_SIZE = 64
+_L1_CACHE = OrderedDict()
+_L1_LOCK = threading.Lock()
+
+# Returned by call_public_endpoint() when the server answers 304 Not Modified
+NOT_MODIFIED = object()
+
+# Keys probed (in order) when turning an error payload into a readable message
+_MSG_KEYS = ('message', 'msg', 'detail', 'error')
+_ERROR_NESTED_KEYS = ('data', 'errors', 'response')
+_TOKEN_ERROR_NESTED_KEYS = ('data', 'user', 'errors')
+
+# Friendly messages for HTTP statuses returned by REUNE consultas/general
+# (5xx entries are only reached after the session's retries are exhausted)
+_REUNE_STATUS_MSGS = {
+    502: (
+        "Error 502 Bad Gateway: El servidor REUNE no está disponible temporalmente. "
+        "Esto puede deberse a mantenimiento o problemas del servidor. "
+        "Por favor, intenta nuevamente más tarde o contacta a CONDUSEF para verificar el estado del servicio."
+    ),
+    503: (
+        "Error 503 Service Unavailable: El servidor REUNE está temporalmente fuera de servicio. "
+        "Por favor, intenta nuevamente más tarde."
+    ),
+    504: (
+        "Error 504 Gateway Timeout: El servidor REUNE tardó demasiado en responder. "
+        "Por favor, intenta nuevamente."
+    ),
+    401: (
+        "Error 401 Unauthorized: Token inválido o expirado. "
+        "Genera un nuevo token desde la página principal."
+    ),
+    403: (
+        "Error 403 Forbidden: No tienes permisos para acceder a este recurso. "
+        "Verifica que tu token tenga los permisos necesarios."
+    ),
+}
+
+# Friendly prefixes for HTTP statuses returned by REDECO /redeco/quejas
+_REDECO_QUEJA_STATUS_MSGS = {
+    401: "Error 401 Unauthorized: token inválido o expirado.",
+    403: "Error 403 Forbidden: no tienes permisos.",
+}
+
+
+def _extract_error_message(d, nested_keys=_ERROR_NESTED_KEYS):
+    """Extract a human-friendly message from the various error shapes the API returns.
+
+    The payload is walked breadth-first through nested_keys, visiting each dict
+    once, so deep or self-referencing payloads cost at most one pass. Without a
+    message key, the first string value of the deepest dict that has one is
+    returned, since nested containers usually hold the specific error.
+    """
+    fallback = None
+    fallback_depth = -1
+    seen = set()
+    queue = deque([(d, 0)])
+    while queue:
+        cur, depth = queue.popleft()
+        if not isinstance(cur, dict) or id(cur) in seen:
+            continue
+        seen.add(id(cur))
+
+        for key in _MSG_KEYS:
+            v = cur.get(key)
+            if isinstance(v, str) and v.strip():
+                return v.strip()
+            if isinstance(v, list) and v:
+                return '; '.join(str(x) for x in v)
+
+        # fallback: remember the first string value, preferring deeper dicts
+        if depth > fallback_depth:
+            value = next((v.strip() for v in cur.values() if isinstance(v, str) and v.strip()), None)
+            if value:
+                fallback, fallback_depth = value, depth
+
+        # nested common containers
+        queue.extend((cur.get(nested_key), depth + 1) for nested_key in nested_keys)
+    return fallback
+
+
+# Candidate keys under which each catalog list may appear in an API response
+MEDIO_KEYS = ('medio', 'medios', 'mediosRecepcion', 'mediosDeRecepcion')
+NIVEL_KEYS = ('niveles', 'nivel', 'nivelesAtencion', 'nivelesDeAtencion')
+ESTADO_KEYS = ('estados', 'estado')
+PRODUCTO_KEYS = ('products', 'productos', 'productsList', 'listaProductos')
+CAUSA_KEYS = ('causas', 'causasList', 'listaCausas')
+
+
+def extract_list(resp, keys) -> list:
+    """Return the catalog list from an API response of unknown shape.
+
+    Probes resp[key] for each key, then the same keys inside resp['data'],
+    then resp['data'] itself if it is a list. A bare list is returned as-is.
+
+    Returns:
+        list: the first non-empty list found, or [] if none
+    """
+    if isinstance(resp, list):
+        return resp
+    if not isinstance(resp, dict):
+        return []
+    nested = resp.get('data')
+    for container in (resp, nested):
+        if isinstance(container, dict):
+            for key in keys:
+                val = container.get(key)
+                if isinstance(val, list) and val:
+                    return val
+    if isinstance(nested, list):
+        return nested
+    return []
+
+
+def submit(fn, *args, **kwargs) -> Future:
+    """Run fn(*args, **kwargs) on the shared API worker pool.
+
+    Returns:
+        Future: call .result() to get the value or re-raise RedeCoAPIError
+    """
+    return _EXECUTOR.submit(fn, *args, **kwargs)
+
+
+def _token_cache_ttl(token: str):
+    """Seconds the token can be cached, from its JWT 'exp' claim (None if unknown)."""
+    try:
+        segment = token.split('.')[1]
+        claims = orjson.loads(base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4)))
+        ttl = int(float(claims['exp']) - time.time()) - TOKEN_CACHE_MARGIN
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+    return ttl if ttl > 0 else None
+
+
 def get_token(username: str, password: str, timeout: int = 10) -> str:
+    """Obtain token_access, reusing a cached token for the same credentials.
+
+    Tokens are cached in Django's cache (shared by all sessions/workers) under
+    a hash of the credentials until shortly before their 'exp' claim.
+    """
+    key = 'redeco:tok:' + hashlib.sha256(f'{username}:{password}'.encode()).hexdigest()
+    token = cache.get(key)
+    if token:
+        return token
+
+    token = _fetch_token(username, password, timeout)
+    ttl = _token_cache_ttl(token)
+    if ttl:
+        cache.set(key, token, ttl)
+    return token
+
+
+def _fetch_token(username: str, password: str, timeout: int = 10) -> str:
     """Call the REDECO auth endpoint to obtain token_access.
 
     The Postman collection indicates the token endpoint is:
     https://api.condusef.gob.mx/auth/users/token/
 
     Note: Postman used GET with a JSON body; we'll mirror that behaviour using
-    requests.request so the library will send the JSON payload even on GET.
+    Session.request so the library will send the JSON payload even on GET.
     """
     base = getattr(settings, 'REDECO_API_BASE', 'https://api.condusef.gob.mx')
     url = f"{base.rstrip('/')}/auth/users/token/"
     payload = {"username": username, "password": password}
 
     try:
-        resp = requests.request('GET', url, json=payload, timeout=timeout)
+        resp = _SESSION.request('GET', url, json=payload, timeout=timeout)
     except requests.RequestException as exc:
         raise RedeCoAPIError(f"Error connecting to REDECO API: {exc}") from exc
 
     if resp.status_code >= 400:
         # try to surface a concise JSON error message if present
         try:
-            data = resp.json()
+            data = orjson.loads(resp.content)
         except Exception:
             # non-json body
             raise RedeCoAPIError(f"API returned {resp.status_code}: {resp.text}")
 
-        # helper to extract human-friendly message from various shapes
-        def _extract_message(d):
-            if not isinstance(d, dict):
-                return None
-            for key in ('message', 'msg', 'detail', 'error'):
-                v = d.get(key)
-                if isinstance(v, str) and v.strip():
-                    return v.strip()
-                if isinstance(v, list) and v:
-                    return '; '.join(str(x) for x in v)
-
-            # nested common containers
-            for nested_key in ('data', 'user', 'errors'):
-                nested = d.get(nested_key)
-                if isinstance(nested, dict):
-                    m = _extract_message(nested)
-                    if m:
-                        return m
-
-            # fallback: return first string value
-            for v in d.values():
-                if isinstance(v, str) and v.strip():
-                    return v.strip()
-            return None
-
-        msg = _extract_message(data) or f"API returned {resp.status_code}"
+        msg = _extract_error_message(data, _TOKEN_ERROR_NESTED_KEYS) or f"API returned {resp.status_code}"
         raise RedeCoAPIError(msg)
 
     try:
-        data = resp.json()
+        data = orjson.loads(resp.content)
     except ValueError:
         raise RedeCoAPIError("API did not return JSON")
 
@@ -89,7 +297,7 @@ def get_token(username: str, password: str, timeout: int = 10) -> str:
     # fallback: search any string value that looks like a JWT
     if not token and isinstance(data, dict):
         for v in data.values():
-            if isinstance(v, str) and v.count('.') == 2:
+            if isinstance(v, str) and _JWT_RE.match(v):
                 token = v
                 break
 
@@ -99,65 +307,141 @@ def get_token(username: str, password: str, timeout: int = 10) -> str:
     return token
 
 
-def call_public_endpoint(path: str, params: dict = None, timeout: int = 10) -> dict:
+def call_public_endpoint(path: str, params: dict = None, timeout: int = 10, etag: str = None) -> dict:
     """Call a public (non-authenticated) REDECO API endpoint.
 
     Args:
         path: the endpoint path (e.g. 'catalogos/medio-recepcion')
         params: query parameters as dict (optional)
         timeout: request timeout in seconds
+        etag: ETag of a cached copy; sent as If-None-Match (optional)
 
     Returns:
-        dict: parsed JSON response from API
+        dict: parsed JSON response from API, or NOT_MODIFIED if the server
+        answered 304 to the conditional request
 
     Raises:
         RedeCoAPIError: if request fails or returns error status
     """
+    return _get_public(path, params, timeout, etag)[0]
+
+
+def _get_public(path: str, params: dict = None, timeout: int = 10, etag: str = None):
+    """Conditional GET of a public endpoint; returns (data or NOT_MODIFIED, response ETag)."""
     base = getattr(settings, 'REDECO_API_BASE', 'https://api.condusef.gob.mx')
     url = f"{base.rstrip('/')}/{path.lstrip('/')}"
+    headers = {'If-None-Match': etag} if etag else None
 
     try:
-        resp = requests.get(url, params=params, timeout=timeout)
+        resp = _SESSION.get(url, headers=headers, params=params, timeout=timeout)
     except requests.RequestException as exc:
         raise RedeCoAPIError(f"Error connecting to REDECO API: {exc}") from exc
 
+    if resp.status_code == 304:
+        return NOT_MODIFIED, resp.headers.get('ETag') or etag
+
     if resp.status_code >= 400:
         try:
-            data = resp.json()
+            data = orjson.loads(resp.content)
         except Exception:
             raise RedeCoAPIError(f"API returned {resp.status_code}: {resp.text}")
 
-        def _extract_message(d):
-            if not isinstance(d, dict):
-                return None
-            for key in ('message', 'msg', 'detail', 'error'):
-                v = d.get(key)
-                if isinstance(v, str) and v.strip():
-                    return v.strip()
-                if isinstance(v, list) and v:
-                    return '; '.join(str(x) for x in v)
-
-            for nested_key in ('data', 'errors', 'response'):
-                nested = d.get(nested_key)
-                if isinstance(nested, dict):
-                    m = _extract_message(nested)
-                    if m:
-                        return m
-
-            for v in d.values():
-                if isinstance(v, str) and v.strip():
-                    return v.strip()
-            return None
-
-        msg = _extract_message(data) or f"API returned {resp.status_code}"
+        msg = _extract_error_message(data) or f"API returned {resp.status_code}"
         raise RedeCoAPIError(msg)
 
     try:
-        return resp.json()
+        return orjson.loads(resp.content), resp.headers.get('ETag')
     except ValueError:
         raise RedeCoAPIError("API did not return JSON")
 
 
+def _l1_set(key: str, data, expires: float):
+    """Remember a public catalog body in this process until expires (epoch seconds)."""
+    with _L1_LOCK:
+        _L1_CACHE.pop(key, None)
+        _L1_CACHE[key] = (expires, data)
+        while len(_L1_CACHE) > PUBLIC_CATALOG_L1_SIZE:
+            _L1_CACHE.popitem(last=False)
+
+
+def _public_catalog_key(path: str, params: dict = None) -> str:
+    query = urlencode(sorted((params or {}).items()))
+    return 'redeco:pub:' + hashlib.blake2b(f'{path}?{query}'.encode(), digest_size=16).hexdigest()
+
+
+def get_public_catalog_cached(path: str, params: dict = None,
+                              timeout_s: int = PUBLIC_CATALOG_CACHE_TIMEOUT) -> dict:
+    """Call a public REDECO endpoint through Django's cache.
+
+    Entries are stored as (etag, body, fresh_until, version). While fresh the
+    body is served as-is; afterwards, if the server sent an ETag, a conditional
+    GET is made and a 304 keeps the cached body for another timeout_s seconds.
+    If the refresh fails, the stale body is served (last good copy) and the
+    refresh is retried after PUBLIC_CATALOG_STALE_RETRY seconds.
+    version identifies the body (see get_public_catalog_version).
+
+    Args:
+        path: the endpoint path (e.g. 'catalogos/medio-recepcion')
+        params: query parameters as dict (optional)
+        timeout_s: seconds the response is served without revalidation
+
+    Returns:
+        dict: parsed JSON response from API (possibly served from cache)
+
+    Raises:
+        RedeCoAPIError: if the upstream request fails and nothing is cached
+    """
+    key = _public_catalog_key(path, params)
+    now = time.time()
+    hit = _L1_CACHE.get(key)
+    if hit and hit[0] > now:
+        return hit[1]
+
+    entry = cache.get(key)
+    if entry and entry[2] > now:
+        _l1_set(key, entry[1], min(entry[2], now + PUBLIC_CATALOG_L1_TIMEOUT))
+        return entry[1]
+
+    cached_etag = entry[0] if entry else None
+    try:
+        data, etag = _get_public(path, params, etag=cached_etag)
+    except RedeCoAPIError:
+        if not entry:
+            raise
+        # Serve the last good copy and leave REDECO alone for a while
+        fresh_until = now + PUBLIC_CATALOG_STALE_RETRY
+        cache.set(key, (entry[0], entry[1], fresh_until, entry[3]), PUBLIC_CATALOG_REVALIDATE_TIMEOUT)
+        _l1_set(key, entry[1], fresh_until)
+        return entry[1]
+    if data is NOT_MODIFIED:
+        data, version = entry[1], entry[3]
+    else:
+        # A digest, never the raw upstream ETag: that one carries quotes (and
+        # maybe W/) and would not survive being quoted again by the views
+        version = hashlib.blake2b(etag.encode() if etag else orjson.dumps(data), digest_size=16).hexdigest()
+
+    cache.set(key, (etag, data, now + timeout_s, version), timeout_s + PUBLIC_CATALOG_REVALIDATE_TIMEOUT)
+    _l1_set(key, data, now + min(timeout_s, PUBLIC_CATALOG_L1_TIMEOUT))
+    return data
+
+
+def get_public_catalog_version(path: str, params: dict = None):
+    """Return an identifier of the cached body for path/params, or None if not cached.
+
+    It is a hex digest of the upstream ETag (or of the body when there is none),
+    so it only changes with the upstream data and is safe to embed in an ETag;
+    views use it to answer conditional GETs with 304.
+    """
+    entry = cache.get(_public_catalog_key(path, params))
+    # A stale entry gets no version, so the view runs and refreshes it
+    return entry[3] if entry and entry[2] > time.time() else None
+
+
+def get_estados() -> dict:
+    """Return the sepomex/estados/ response, served from cache when available."""
+    return get_public_catalog_cached('sepomex/estados/', timeout_s=STATIC_CATALOG_CACHE_TIMEOUT)
+
+
 def call_protected_endpoint(path: str, token: str, params: dict = None, timeout: int = 10) -> dict:
     """Call an authenticated REDECO API endpoint.
 
@@ -181,47 +465,101 @@ def call_protected_endpoint(path: str, token: str, params: dict = None, timeout:
     }
 
     try:
-        resp = requests.get(url, headers=headers, params=params, timeout=timeout)
+        resp = _SESSION.get(url, headers=headers, params=params, timeout=timeout)
     except requests.RequestException as exc:
         raise RedeCoAPIError(f"Error connecting to REDECO API: {exc}") from exc
 
     if resp.status_code >= 400:
         try:
-            data = resp.json()
+            data = orjson.loads(resp.content)
         except Exception:
             raise RedeCoAPIError(f"API returned {resp.status_code}: {resp.text}")
 
-        def _extract_message(d):
-            if not isinstance(d, dict):
-                return None
-            for key in ('message', 'msg', 'detail', 'error'):
-                v = d.get(key)
-                if isinstance(v, str) and v.strip():
-                    return v.strip()
-                if isinstance(v, list) and v:
-                    return '; '.join(str(x) for x in v)
-
-            for nested_key in ('data', 'errors', 'response'):
-                nested = d.get(nested_key)
-                if isinstance(nested, dict):
-                    m = _extract_message(nested)
-                    if m:
-                        return m
-
-            for v in d.values():
-                if isinstance(v, str) and v.strip():
-                    return v.strip()
-            return None
-
-        msg = _extract_message(data) or f"API returned {resp.status_code}"
+        msg = _extract_error_message(data) or f"API returned {resp.status_code}"
         raise RedeCoAPIError(msg)
 
     try:
-        return resp.json()
+        return orjson.loads(resp.content)
     except ValueError:
         raise RedeCoAPIError("API did not return JSON")
 
 
+def call_protected_cached(path: str, token: str, params: dict = None,
+                          ttl: int = PROTECTED_CATALOG_CACHE_TIMEOUT) -> dict:
+    """Call an authenticated REDECO endpoint through Django's cache.
+
+    The key includes a hash of the token (never the token itself), so each
+    institution only ever sees responses fetched with its own credentials.
+
+    Args:
+        path: the endpoint path (e.g. 'catalogos/products-list')
+        token: JWT token to use in Authorization header
+        params: query parameters as dict (optional)
+        ttl: seconds the response stays cached
+
+    Returns:
+        dict: parsed JSON response from API (possibly served from cache)
+
+    Raises:
+        RedeCoAPIError: if the upstream request fails on a cache miss
+    """
+    query = urlencode(sorted((params or {}).items()))
+    path_hash = hashlib.blake2b(f'{path}?{query}'.encode(), digest_size=16).hexdigest()
+    token_hash = hashlib.blake2b((token or '').encode(), digest_size=16).hexdigest()
+    key = f'redeco:prot:{path_hash}:{token_hash}'
+    return cache.get_or_set(key, lambda: call_protected_endpoint(path, token, params), ttl)
+
+
+def get_productos(token: str) -> list:
+    """Normalized productos list for dropdowns, from the per-token protected cache.
+
+    Returns:
+        list: the productos, or [] if the catalog could not be fetched
+    """
+    try:
+        return extract_list(call_protected_cached('catalogos/products-list', token), PRODUCTO_KEYS)
+    except RedeCoAPIError:
+        return []
+
+
+def get_form_catalogs(token: str = None) -> dict:
+    """Normalized catalog lists for the queja form selects.
+
+    The public lists (medios, niveles, estados) are cached together, already
+    normalized, so a warm call is a single cache GET. On a miss they are
+    fetched concurrently; a failed catalog becomes [] and the triple is then
+    not cached, so a transient error does not stick for the whole TTL.
+    productos comes from the per-token protected cache.
+
+    Returns:
+        dict: {'medios': [...], 'niveles': [...], 'estados': [...], 'productos': [...]}
+    """
+    prod_future = submit(get_productos, token) if token else None
+
+    catalogs = cache.get(FORM_CATALOGS_CACHE_KEY)
+    if catalogs is None:
+        futures = {
+            'medios': (submit(get_public_catalog_cached, 'catalogos/medio-recepcion',
+                              timeout_s=STATIC_CATALOG_CACHE_TIMEOUT), MEDIO_KEYS),
+            'niveles': (submit(get_public_catalog_cached, 'catalogos/niveles-atencion',
+                               timeout_s=STATIC_CATALOG_CACHE_TIMEOUT), NIVEL_KEYS),
+            'estados': (submit(get_estados), ESTADO_KEYS),
+        }
+        catalogs = {}
+        complete = True
+        for name, (future, keys) in futures.items():
+            try:
+                catalogs[name] = extract_list(future.result(), keys)
+            except RedeCoAPIError:
+                catalogs[name] = []
+                complete = False
+        if complete:
+            cache.set(FORM_CATALOGS_CACHE_KEY, catalogs, PUBLIC_CATALOG_CACHE_TIMEOUT)
+
+    productos = prod_future.result() if prod_future is not None else []
+    return {**catalogs, 'productos': productos}
+
+
 def post_reune_consultas_general(token: str, payload, timeout: int = 15) -> dict:
     """POST to REUNE consultas/general with Authorization header.
 
@@ -245,7 +583,7 @@ def post_reune_consultas_general(token: str, payload, timeout: int = 15) -> dict
     }
 
     try:
-        resp = requests.post(url, headers=headers, json=payload, timeout=timeout)
+        resp = _SESSION.post(url, headers=headers, data=orjson.dumps(payload), timeout=timeout)
     except requests.Timeout:
         raise RedeCoAPIError(
             "Timeout al conectar con la API REUNE. El servidor no respondió a tiempo. "
@@ -260,36 +598,13 @@ def post_reune_consultas_general(token: str, payload, timeout: int = 15) -> dict
         raise RedeCoAPIError(f"Error al conectar con la API REUNE: {exc}") from exc
 
     # Handle specific HTTP error codes with friendly messages
-    if resp.status_code == 502:
-        raise RedeCoAPIError(
-            "Error 502 Bad Gateway: El servidor REUNE no está disponible temporalmente. "
-            "Esto puede deberse a mantenimiento o problemas del servidor. "
-            "Por favor, intenta nuevamente más tarde o contacta a CONDUSEF para verificar el estado del servicio."
-        )
-    elif resp.status_code == 503:
-        raise RedeCoAPIError(
-            "Error 503 Service Unavailable: El servidor REUNE está temporalmente fuera de servicio. "
-            "Por favor, intenta nuevamente más tarde."
-        )
-    elif resp.status_code == 504:
-        raise RedeCoAPIError(
-            "Error 504 Gateway Timeout: El servidor REUNE tardó demasiado en responder. "
-            "Por favor, intenta nuevamente."
-        )
-    elif resp.status_code == 401:
-        raise RedeCoAPIError(
-            "Error 401 Unauthorized: Token inválido o expirado. "
-            "Genera un nuevo token desde la página principal."
-        )
-    elif resp.status_code == 403:
-        raise RedeCoAPIError(
-            "Error 403 Forbidden: No tienes permisos para acceder a este recurso. "
-            "Verifica que tu token tenga los permisos necesarios."
-        )
-    elif resp.status_code >= 400:
+    msg = _REUNE_STATUS_MSGS.get(resp.status_code)
+    if msg:
+        raise RedeCoAPIError(msg)
+    if resp.status_code >= 400:
         # Try to extract detailed error message from response
         try:
-            data = resp.json()
+            data = orjson.loads(resp.content)
         except Exception:
             raise RedeCoAPIError(f"API REUNE retornó error {resp.status_code}: {resp.text[:200]}")
 
@@ -300,7 +615,7 @@ def post_reune_consultas_general(token: str, payload, timeout: int = 15) -> dict
         raise RedeCoAPIError(msg or f"API REUNE retornó error {resp.status_code}")
 
     try:
-        return resp.json()
+        return orjson.loads(resp.content)
     except ValueError:
         raise RedeCoAPIError("La API REUNE no retornó un JSON válido en la respuesta")
 
@@ -326,7 +641,7 @@ def get_reune_consultas_total(token: str, timeout: int = 15) -> dict:
     }
     
     try:
-        resp = requests.get(url, headers=headers, timeout=timeout)
+        resp = _SESSION.get(url, headers=headers, timeout=timeout)
     except requests.Timeout:
         raise RedeCoAPIError("Timeout al consultar total de folios REUNE.")
     except requests.ConnectionError:
@@ -340,7 +655,7 @@ def get_reune_consultas_total(token: str, timeout: int = 15) -> dict:
         raise RedeCoAPIError(f"API REUNE retornó error {resp.status_code}")
     
     try:
-        return resp.json()
+        return orjson.loads(resp.content)
     except ValueError:
         raise RedeCoAPIError("Respuesta inválida de REUNE")
 
@@ -367,7 +682,7 @@ def get_reune_consultas_page(token: str, page: str, timeout: int = 15) -> dict:
     }
     
     try:
-        resp = requests.get(url, headers=headers, timeout=timeout)
+        resp = _SESSION.get(url, headers=headers, timeout=timeout)
     except requests.Timeout:
         raise RedeCoAPIError("Timeout al consultar folios REUNE.")
     except requests.ConnectionError:
@@ -381,7 +696,7 @@ def get_reune_consultas_page(token: str, page: str, timeout: int = 15) -> dict:
         raise RedeCoAPIError(f"API REUNE retornó error {resp.status_code}")
     
     try:
-        return resp.json()
+        return orjson.loads(resp.content)
     except ValueError:
         raise RedeCoAPIError("Respuesta inválida de REUNE")
 
@@ -411,7 +726,7 @@ def delete_reune_consulta_folio(token: str, folio: str, timeout: int = 15) -> di
     payload = {"folio": folio}
     
     try:
-        resp = requests.delete(url, headers=headers, json=payload, timeout=timeout)
+        resp = _SESSION.delete(url, headers=headers, data=orjson.dumps(payload), timeout=timeout)
     except requests.Timeout:
         raise RedeCoAPIError("Timeout al eliminar folio REUNE.")
     except requests.ConnectionError:
@@ -425,14 +740,14 @@ def delete_reune_consulta_folio(token: str, folio: str, timeout: int = 15) -> di
         raise RedeCoAPIError(f"Folio '{folio}' no encontrado.")
     elif resp.status_code >= 400:
         try:
-            data = resp.json()
+            data = orjson.loads(resp.content)
             msg = data.get('message') or data.get('error')
             raise RedeCoAPIError(msg or f"Error {resp.status_code}")
         except ValueError:
             raise RedeCoAPIError(f"API REUNE retornó error {resp.status_code}")
     
     try:
-        return resp.json()
+        return orjson.loads(resp.content)
     except ValueError:
         raise RedeCoAPIError("Respuesta inválida de REUNE")
 
@@ -460,7 +775,7 @@ def create_queja(token: str, payload, timeout: int = 20) -> dict:
     }
 
     try:
-        resp = requests.post(url, headers=headers, json=payload, timeout=timeout)
+        resp = _SESSION.post(url, headers=headers, data=orjson.dumps(payload), timeout=timeout)
     except requests.Timeout:
         raise RedeCoAPIError("Timeout al conectar con la API REDECO. Por favor intenta nuevamente más tarde.")
     except requests.ConnectionError:
@@ -470,7 +785,7 @@ def create_queja(token: str, payload, timeout: int = 20) -> dict:
 
     # Siempre intentar parsear JSON primero
     try:
-        data = resp.json()
+        data = orjson.loads(resp.content)
     except Exception:
         data = None
 
@@ -480,10 +795,9 @@ def create_queja(token: str, payload, timeout: int = 20) -> dict:
         return {'status': 'ok', 'code': resp.status_code, 'text': resp.text}
 
     # Handle common errors with friendly messages - pero preservar la data JSON completa
-    if resp.status_code == 401:
-        raise RedeCoAPIError(f"Error 401 Unauthorized: token inválido o expirado. Respuesta: {data or resp.text[:200]}")
-    if resp.status_code == 403:
-        raise RedeCoAPIError(f"Error 403 Forbidden: no tienes permisos. Respuesta: {data or resp.text[:200]}")
+    msg = _REDECO_QUEJA_STATUS_MSGS.get(resp.status_code)
+    if msg:
+        raise RedeCoAPIError(f"{msg} Respuesta: {data or resp.text[:200]}")
     if resp.status_code >= 400:
         if data:
             # Incluir la data completa en el mensaje de error para debugging
@@ -497,3 +811,35 @@ def create_queja(token: str, payload, timeout: int = 20) -> dict:
                 raise RedeCoAPIError(f"API REDECO retornó error {resp.status_code}: {data}")
         else:
             raise RedeCoAPIError(f"API REDECO retornó error {resp.status_code}: {resp.text[:200]}")
+
+
+def bulk_create_clientes(clientes, batch_size: int = CLIENTE_BULK_BATCH_SIZE) -> tuple:
+    """Insert many validated clientes with multi-row INSERTs instead of one save() per row.
+
+    Clientes whose RFC is already registered, or repeated earlier in the list,
+    are skipped. They are counted by looking their RFCs up inside the same
+    transaction as the INSERT, not by comparing table counts, so concurrent
+    writes do not skew the totals; ignore_conflicts only guards against a
+    row committed by another request in between.
+
+    Args:
+        clientes: unsaved Cliente instances, already validated (full_clean).
+        batch_size: rows per SELECT/INSERT statement.
+
+    Returns:
+        tuple: (created, duplicates)
+    """
+    clientes = list(clientes)
+    by_rfc = {}
+    for cliente in clientes:
+        by_rfc.setdefault(cliente.rfc, cliente)
+    rfcs = list(by_rfc)
+    with transaction.atomic():
+        existing = set()
+        for start in range(0, len(rfcs), batch_size):
+            existing.update(
+                Cliente.objects.filter(rfc__in=rfcs[start:start + batch_size]).values_list('rfc', flat=True)
+            )
+        new = [cliente for rfc, cliente in by_rfc.items() if rfc not in existing]
+        Cliente.objects.bulk_create(new, batch_size=batch_size, ignore_conflicts=True)
+    return len(new), len(clientes) - len(new)
@@ -0,0 +1,310 @@
+import io
+from types import SimpleNamespace
+from unittest import mock
+
+import orjson
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import services
+from .models import Cliente
+
+
+class FakeResponse:
+    """Minimal requests.Response stand-in for the REDECO session."""
+
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self.content = orjson.dumps(data) if data is not None else b''
+        self.text = self.content.decode()
+        self.headers = headers or {}
+
+
+class FakeSession:
+    """Replaces services._SESSION; answers with queued responses and records requests."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        self.calls.append((url, headers, params))
+        resp = self.responses.pop(0)
+        if isinstance(resp, Exception):
+            raise resp
+        return resp
+
+
+class RoutedSession:
+    """Replaces services._SESSION; answers by the first route contained in the URL."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        self.calls.append((url, headers, params))
+        for route, resp in self.routes.items():
+            if route in url:
+                return resp
+        return FakeResponse(404, {'message': 'no encontrado'})
+
+
+ESTADOS = {'estados': [{'claveEdo': 9, 'estado': 'Ciudad de México'}]}
+
+CLIENTE_POST = {
+    'nombre': 'Ana',
+    'rfc': 'AAAA000101AAA',
+    'tipo_persona': '1',
+    'estado_id': '9',
+    'estado_nombre': 'Ciudad de México',
+    'codigo_postal': '01000',
+}
+
+
+class CacheTestCase(TestCase):
+    """Starts every test with empty Django and in-process catalog caches."""
+
+    def setUp(self):
+        cache.clear()
+        services._L1_CACHE.clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(services._L1_CACHE.clear)
+
+
+class PublicCatalogCacheTests(CacheTestCase):
+    path = 'catalogos/medio-recepcion'
+    data = {'medio': [{'medioId': 1, 'medioDsc': 'Web'}]}
+
+    def setUp(self):
+        super().setUp()
+        self.now = 1_000_000.0
+        patcher = mock.patch.object(services, 'time', SimpleNamespace(time=lambda: self.now))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def use_session(self, *responses):
+        session = FakeSession(*responses)
+        patcher = mock.patch.object(services, '_SESSION', session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return session
+
+    def expire(self):
+        """Move past the fresh window and drop this process's L1 copy."""
+        self.now += services.PUBLIC_CATALOG_CACHE_TIMEOUT + 1
+        services._L1_CACHE.clear()
+
+    def test_l1_hit_skips_shared_cache(self):
+        session = self.use_session(FakeResponse(200, self.data, {'ETag': '"v1"'}))
+        self.assertEqual(services.get_public_catalog_cached(self.path), self.data)
+        with mock.patch.object(services.cache, 'get') as cache_get:
+            self.assertEqual(services.get_public_catalog_cached(self.path), self.data)
+        cache_get.assert_not_called()
+        self.assertEqual(len(session.calls), 1)
+
+    def test_fresh_shared_entry_is_served_without_upstream_call(self):
+        session = self.use_session(FakeResponse(200, self.data, {'ETag': '"v1"'}))
+        services.get_public_catalog_cached(self.path)
+        services._L1_CACHE.clear()
+        self.assertEqual(services.get_public_catalog_cached(self.path), self.data)
+        self.assertEqual(len(session.calls), 1)
+
+    def test_expired_entry_is_revalidated_with_etag(self):
+        session = self.use_session(
+            FakeResponse(200, self.data, {'ETag': '"v1"'}),
+            FakeResponse(304),
+        )
+        services.get_public_catalog_cached(self.path)
+        version = services.get_public_catalog_version(self.path)
+        self.expire()
+
+        self.assertEqual(services.get_public_catalog_cached(self.path), self.data)
+        self.assertEqual(session.calls[1][1], {'If-None-Match': '"v1"'})
+        self.assertEqual(services.get_public_catalog_version(self.path), version)
+
+    def test_stale_copy_is_served_when_refresh_fails(self):
+        session = self.use_session(
+            FakeResponse(200, self.data, {'ETag': '"v1"'}),
+            FakeResponse(500, {'message': 'caído'}),
+        )
+        services.get_public_catalog_cached(self.path)
+        self.expire()
+
+        self.assertEqual(services.get_public_catalog_cached(self.path), self.data)
+        # The failed refresh is not retried until PUBLIC_CATALOG_STALE_RETRY passes
+        services._L1_CACHE.clear()
+        self.assertEqual(services.get_public_catalog_cached(self.path), self.data)
+        self.assertEqual(len(session.calls), 2)
+
+    def test_error_without_cached_copy_is_raised(self):
+        self.use_session(FakeResponse(500, {'message': 'caído'}))
+        with self.assertRaisesMessage(services.RedeCoAPIError, 'caído'):
+            services.get_public_catalog_cached(self.path)
+
+
+class ExtractErrorMessageTests(TestCase):
+
+    def test_message_key_wins_over_other_strings(self):
+        data = {'status': 'error', 'data': {'message': 'Token inválido'}}
+        self.assertEqual(services._extract_error_message(data), 'Token inválido')
+
+    def test_nested_fallback_wins_over_top_level_string(self):
+        data = {'status': 'error', 'data': {'info': 'Folio duplicado'}}
+        self.assertEqual(services._extract_error_message(data), 'Folio duplicado')
+
+    def test_self_referencing_payload_terminates(self):
+        data = {'status': 'error'}
+        data['data'] = data
+        self.assertEqual(services._extract_error_message(data), 'error')
+
+
+class RetryPolicyTests(TestCase):
+
+    def test_reune_consulta_post_is_not_retried_once_it_may_have_arrived(self):
+        base = settings.REUNE_API_BASE.rstrip('/')
+        retry = services._SESSION.get_adapter(base + '/reune/consultas/general').max_retries
+        self.assertIn('POST', retry.allowed_methods)
+        self.assertEqual(retry.read, 0)
+        self.assertFalse(retry.is_retry('POST', 504))
+        self.assertTrue(retry.is_retry('POST', 503))
+        other = services._SESSION.get_adapter(base + '/reune/consultas/obtener/consultageneral/total').max_retries
+        self.assertNotIn('POST', other.allowed_methods)
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class CatalogViewTests(CacheTestCase):
+
+    def use_routes(self, routes):
+        patcher = mock.patch.object(services, '_SESSION', RoutedSession(routes))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assert_revalidates(self, url):
+        self.client.get(url)  # primes the catalog and sets the session cookie
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertNotIn('"', etag.removeprefix('W/').strip('"'))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_catalog_with_quoted_upstream_etag_answers_304(self):
+        self.use_routes({
+            'catalogos/medio-recepcion': FakeResponse(
+                200, {'medio': [{'medioId': 1, 'medioDsc': 'Web'}]}, {'ETag': 'W/"e1"'}),
+        })
+        self.assert_revalidates(reverse('redeco_frontend:catalogs_medios'))
+
+    def test_sepomex_lookup_with_quoted_upstream_etags_answers_304(self):
+        self.use_routes({
+            'sepomex/estados': FakeResponse(200, ESTADOS, {'ETag': '"a"'}),
+            'sepomex/municipios': FakeResponse(
+                200, {'municipios': [{'municipioId': 1, 'municipio': 'Álvaro Obregón'}]}, {'ETag': 'W/"b"'}),
+        })
+        self.assert_revalidates(reverse('redeco_frontend:catalogs_municipios') + '?estado_id=9&cp=01000')
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class ClienteViewTests(CacheTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(services, 'get_estados', return_value=ESTADOS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_cliente(self, **kwargs):
+        values = {
+            'nombre': 'Ana', 'rfc': 'AAAA000101AAA', 'tipo_persona': 1,
+            'estado_id': 9, 'estado_nombre': 'Ciudad de México', 'codigo_postal': '01000',
+        }
+        values.update(kwargs)
+        return Cliente.objects.create(**values)
+
+    def test_edit_saves_with_a_single_update(self):
+        cliente = self.create_cliente()
+        url = reverse('redeco_frontend:clientes_edit', args=[cliente.pk])
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(url, {**CLIENTE_POST, 'nombre': 'Beatriz'})
+        self.assertRedirects(response, reverse('redeco_frontend:clientes_list'), fetch_redirect_response=False)
+        cliente_queries = [q['sql'] for q in ctx.captured_queries if 'redeco_frontend_cliente' in q['sql']]
+        self.assertEqual(len(cliente_queries), 1)
+        self.assertTrue(cliente_queries[0].startswith('UPDATE'))
+        cliente.refresh_from_db()
+        self.assertEqual(cliente.nombre, 'Beatriz')
+
+    def test_edit_missing_cliente_is_404(self):
+        url = reverse('redeco_frontend:clientes_edit', args=[999])
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.post(url, CLIENTE_POST).status_code, 404)
+        self.assertEqual(self.client.post(url, {**CLIENTE_POST, 'edad': 'x'}).status_code, 404)
+
+    def test_edit_invalid_field_keeps_submitted_values(self):
+        cliente = self.create_cliente()
+        url = reverse('redeco_frontend:clientes_edit', args=[cliente.pk])
+        response = self.client.post(url, {**CLIENTE_POST, 'nombre': 'Beatriz', 'codigo_postal': '123'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'El código postal debe tener 5 dígitos.')
+        self.assertContains(response, 'value="Beatriz"')
+        cliente.refresh_from_db()
+        self.assertEqual(cliente.nombre, 'Ana')
+
+    def test_resubmitted_form_creates_one_cliente(self):
+        url = reverse('redeco_frontend:clientes_create')
+        data = {**CLIENTE_POST, 'idem': 'a' * 32}
+        self.client.post(url, data)
+        response = self.client.post(url, data)
+        self.assertRedirects(response, reverse('redeco_frontend:clientes_list'), fetch_redirect_response=False)
+        self.assertEqual(Cliente.objects.count(), 1)
+
+    def test_failed_submit_releases_idempotency_key(self):
+        url = reverse('redeco_frontend:clientes_create')
+        data = {**CLIENTE_POST, 'idem': 'b' * 32}
+        response = self.client.post(url, {**data, 'codigo_postal': '123'})
+        self.assertEqual(response.status_code, 200)
+        self.client.post(url, data)
+        self.assertEqual(Cliente.objects.count(), 1)
+
+    def test_import_reports_created_duplicate_and_invalid_rows(self):
+        self.create_cliente(rfc='DUPL000101AAA')
+        csv_text = (
+            'nombre,rfc,tipo_persona,estado_id,codigo_postal\n'
+            'Ana,AAAA000101AAA,1,9,01000\n'
+            'Bea,DUPL000101AAA,1,9,01000\n'
+            'Ana bis,AAAA000101AAA,1,9,01000\n'
+            'Carlos,CCCC000101AAA,1,9,\n'
+        )
+        archivo = io.BytesIO(csv_text.encode())
+        archivo.name = 'clientes.csv'
+        response = self.client.post(reverse('redeco_frontend:clientes_import'), {'archivo': archivo}, follow=True)
+        self.assertContains(response, '1 clientes importados, 2 con RFC ya registrado, 1 filas inválidas (5).')
+        self.assertEqual(Cliente.objects.count(), 2)
+
+    def test_list_answers_304_until_clientes_change(self):
+        self.create_cliente()
+        url = reverse('redeco_frontend:clientes_list')
+        self.client.get(url)  # sets the session and CSRF cookies the ETag depends on
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.create_cliente(rfc='BBBB000101AAA')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class ClienteModelTests(TestCase):
+
+    def test_persona_moral_allows_edad_cero_but_not_edad(self):
+        values = {
+            'nombre': 'Empresa', 'rfc': 'EMP000101AAA', 'tipo_persona': 2,
+            'estado_id': 9, 'codigo_postal': '01000',
+        }
+        Cliente(**values, edad=0).full_clean()
+        with self.assertRaisesMessage(ValidationError, 'Las personas morales no pueden tener sexo o edad.'):
+            Cliente(**values, edad=30).full_clean()
@@ -1,15 +1,340 @@
+import csv
+import hashlib
+import io
+import re
+from datetime import date, datetime
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
-from django.views.decorators.http import require_http_methods
+from django.utils import timezone
+from django.utils.cache import add_never_cache_headers
+from django.views.decorators.cache import cache_page
+from django.views.decorators.http import etag, require_http_methods
+from django.views.decorators.vary import vary_on_cookie, vary_on_headers
 from functools import wraps
+from types import MappingProxyType
+from uuid import uuid4
+import orjson
 from . import services
 from .models import Cliente
 
 
+# Columnas que muestra clientes_list.html; el resto no se trae de la BD
+CLIENTE_LIST_FIELDS = (
+    'id', 'nombre', 'rfc', 'tipo_persona', 'estado_id', 'estado_nombre', 'codigo_postal',
+    'municipio_id', 'municipio_nombre', 'colonia_id', 'colonia_nombre', 'sexo', 'edad',
+)
+# Relaciones a traer con select_related() en clientes_list. Hoy Cliente no
+# tiene ForeignKeys (ver models.py); es el único punto a editar cuando existan.
+CLIENTE_FK_FIELDS = ()
+CLIENTES_PER_PAGE = 25
+# Segundos que se recuerda un formulario de cliente ya guardado (campo oculto
+# 'idem'), para que un doble clic o reintento no lo procese otra vez
+CLIENTE_IDEM_TIMEOUT = 300
+
+# Catálogos públicos de una sola consulta servidos por catalog_view:
+# slug -> (endpoint, template, claves a normalizar o None, clave en data)
+CATALOGS = {
+    'medios': ('catalogos/medio-recepcion', 'catalogs_medios.html', services.MEDIO_KEYS, 'medio'),
+    'niveles-atencion': ('catalogos/niveles-atencion', 'catalogs_niveles_atencion.html', None, None),
+    'estados': ('sepomex/estados/', 'catalogs_estados.html', None, None),
+}
+
+# Páginas con catálogos protegidos: se guardan completas por sesión (cookie)
+PROTECTED_PAGE_CACHE_TIMEOUT = 60
+# Páginas de catálogos públicos (prefijo 'cat'), guardadas por sesión; un
+# acierto evita tanto la llamada a REDECO como el render del template
+PUBLIC_PAGE_CACHE_TIMEOUT = 300
+
+# Credenciales de ejemplo que muestra login.html (solo lectura)
+LOGIN_EXAMPLE = MappingProxyType({
+    'username': 'UCISA',
+    'password': 'Ucisa.condusef.api_24',
+})
+LOGIN_REQUIRED_MSG = 'Debes iniciar sesión antes de acceder a esta página.'
+ERR_NO_TOKEN = 'Token no disponible. Genera un token desde la página principal.'
+
+# Fechas de <input type="date"> (YYYY-MM-DD) y ya formateadas (dd/mm/yyyy)
+_ISO_DATE_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})$')
+_DMY_DATE_RE = re.compile(r'^(\d{2})/(\d{2})/(\d{4})$')
+
+
+def _catalog_etag(request, slug):
+    """ETag function for catalog_view, from the cached catalog's version.
+
+    Returns None (no ETag, view runs normally) until the catalog is cached.
+    """
+    path = CATALOGS[slug][0]
+    version = services.get_public_catalog_version(path)
+    return f'{path}:{version}' if version else None
+
+
+def _sepomex_etag(path, param_names, with_estados=True):
+    """ETag function for sepomex lookup views, a digest of the cached versions
+    of the estados dropdown (if shown) and of the lookup for the requested params.
+
+    Returns None (view runs normally) while any catalog the page shows is not cached.
+    """
+    def _etag(request):
+        parts = []
+        if with_estados:
+            version = services.get_public_catalog_version('sepomex/estados/')
+            if not version:
+                return None
+            parts.append(version)
+        params = {name: request.GET.get(name) for name in param_names}
+        if all(params.values()):
+            version = services.get_public_catalog_version(path, params)
+            if not version:
+                return None
+            parts.append(version)
+        if not parts:
+            return None
+        return hashlib.blake2b(':'.join([path, *parts]).encode(), digest_size=16).hexdigest()
+    return _etag
+
+
+def _clientes_list_etag(request):
+    """ETag function for clientes_list, from the row count and latest updated_at.
+
+    Every create, edit, import or delete changes one of the two. The CSRF
+    cookie is included because the page embeds forms with its token. Returns
+    None (view runs normally) while there are flash messages to show.
+    """
+    if messages.get_messages(request):
+        return None
+    stats = Cliente.objects.aggregate(n=Count('id'), last=Max('updated_at'))
+    csrf = request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')
+    return hashlib.blake2b(f"{stats['n']}:{stats['last']}:{csrf}".encode(), digest_size=16).hexdigest()
+
+
+def _render_catalog(request, template, context):
+    """render() for a page-cached catalog view; a page showing an error is
+    not cached, so the next request retries the upstream call."""
+    response = render(request, template, context)
+    if context.get('error'):
+        add_never_cache_headers(response)
+    return response
+
+
+def _fmt_date(d):
+    """Convert an html date (YYYY-MM-DD) to dd/mm/yyyy as used in the API.
+
+    Values already in dd/mm/yyyy are returned as-is; anything else (including
+    impossible dates) falls back to strptime and, failing that, is returned
+    unchanged.
+    """
+    if not d:
+        return None
+    m = _ISO_DATE_RE.match(d)
+    if m:
+        y, mo, day = m.groups()
+    else:
+        m = _DMY_DATE_RE.match(d)
+        if m:
+            day, mo, y = m.groups()
+    if m:
+        try:
+            date(int(y), int(mo), int(day))
+        except ValueError:
+            return d
+        return f'{day}/{mo}/{y}'
+    try:
+        # Accept YYYY-MM-DD or already dd/mm/yyyy without zero padding
+        fmt = '%Y-%m-%d' if '-' in d else '%d/%m/%Y'
+        return datetime.strptime(d, fmt).strftime('%d/%m/%Y')
+    except ValueError:
+        return d
+
+
+def _int_or_1(v):
+    return int(v) if v.isdigit() else 1
+
+
+def _int_or_str(v):
+    return int(v) if v.isdigit() else v
+
+
+def _opt_int(v):
+    return int(v) if v.isdigit() else None
+
+
+def _opt_pos_int(v):
+    n = int(v) if v.isdigit() else 0
+    return n if n > 0 else None
+
+
+def _opt_str(v):
+    return v or None
+
+
+def _int_if_set(v):
+    return int(v) if v else None
+
+
+# (campo del form = campo de Cliente, conversión) para clientes_create/edit;
+# una conversión que falla se reporta como ValidationError del campo
+_CLIENTE_FORM_SPEC = (
+    ('nombre', str),
+    ('rfc', str),
+    ('tipo_persona', int),
+    ('estado_id', int),
+    ('estado_nombre', str),
+    ('codigo_postal', str),
+    ('municipio_id', _int_if_set),
+    ('municipio_nombre', str),
+    ('colonia_id', _int_if_set),
+    ('colonia_nombre', str),
+    ('localidad', str),
+    ('sexo', _opt_str),
+    ('edad', _int_if_set),
+)
+_CLIENTE_REQUIRED_FIELDS = ('nombre', 'rfc', 'tipo_persona', 'estado_id', 'codigo_postal')
+
+# Campos del formulario de consultas REUNE (POST)
+_REUNE_POST_FIELDS = (
+    'institucion_clave', 'sector', 'consultas_trim', 'num_consultas', 'consultas_folio',
+    'consultas_estatus_con', 'consultas_fec_aten', 'consultas_fec_recepcion', 'consultas_pori',
+    'medios_id', 'consultas_cat_nivel_aten_id', 'producto', 'causa_id', 'estados_id',
+    'consultas_cp', 'consultas_mpio_id', 'consultas_loc_id', 'consultas_col_id',
+)
+
+# Campos del formulario de queja (POST) y los que se toman del Cliente elegido
+_QUEJA_POST_FIELDS = (
+    'no_trim', 'quejas_num', 'folio', 'fecha_recepcion', 'medio_id', 'nivel_id', 'producto',
+    'causas_id', 'pori', 'estatus', 'cliente_id', 'fecha_resolucion', 'fecha_notificacion',
+    'respuesta', 'num_penal', 'penalizacion_id',
+)
+_QUEJA_CLIENTE_FIELDS = ('estado_id', 'municipio', 'colonia', 'cp', 'localidad', 'tipo_persona', 'sexo', 'edad')
+_QUEJA_REQUIRED_FIELDS = (
+    'no_trim', 'folio', 'fecha_recepcion', 'medio_id', 'nivel_id', 'producto', 'causas_id', 'pori',
+    'estatus', 'estado_id', 'municipio', 'colonia', 'cp', 'tipo_persona',
+)
+# Valores aceptados para PORI y estatus (1 Pendiente, 2 Concluido)
+_PORI_VALID = frozenset(('SI', 'NO'))
+_ESTATUS_VALID = frozenset(('1', '2'))
+# Medios de recepción que exigen CP en REUNE: UNE (1), Sucursal (2), Oficina (4)
+_MEDIOS_CON_CP = frozenset(('1', '2', '4'))
+# (campo del form, clave del payload REDECO, conversión); None = se omite
+_QUEJA_PAYLOAD_SPEC = (
+    ('no_trim', 'QuejasNoTrim', int),
+    ('quejas_num', 'QuejasNum', _int_or_1),
+    ('folio', 'QuejasFolio', str),
+    ('fecha_recepcion', 'QuejasFecRecepcion', _fmt_date),
+    ('medio_id', 'MedioId', _int_or_str),
+    ('nivel_id', 'NivelATId', _int_or_str),
+    ('producto', 'product', str),
+    ('causas_id', 'CausasId', str),  # Mantener como string
+    ('pori', 'QuejasPORI', str),
+    ('estatus', 'QuejasEstatus', _int_or_str),
+    ('estado_id', 'EstadosId', _int_or_str),
+    ('municipio', 'QuejasMunId', _int_or_str),  # Debe ser numérico
+    ('colonia', 'QuejasColId', _int_or_str),  # Debe ser numérico
+    ('cp', 'QuejasCP', _int_or_str),  # Debe ser numérico
+    ('tipo_persona', 'QuejasTipoPersona', _int_or_str),
+    ('localidad', 'QuejasLocId', _opt_int),
+    ('sexo', 'QuejasSexo', _opt_str),
+    ('edad', 'QuejasEdad', _opt_int),
+    ('fecha_resolucion', 'QuejasFecResolucion', _fmt_date),
+    ('fecha_notificacion', 'QuejasFecNotificacion', _fmt_date),
+    ('respuesta', 'QuejasRespuesta', _opt_int),
+    ('num_penal', 'QuejasNumPenal', _opt_pos_int),
+    ('penalizacion_id', 'PenalizacionId', _opt_int),
+)
+
+
+def _pretty_json(obj) -> bytes:
+    """Serialize obj as indented UTF-8 JSON for display (raw responses, payloads)."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+
+def _cliente_form(post):
+    """Stripped cliente form values from request.POST or a CSV row (RFC in upper case)."""
+    form = {f: (post.get(f) or '').strip() for f, _ in _CLIENTE_FORM_SPEC}
+    form['rfc'] = form['rfc'].upper()
+    return form
+
+
+def _convert_cliente_form(form):
+    """Convert _cliente_form() values to Cliente field values.
+
+    Returns:
+        tuple: (values, errors); a value that does not convert keeps its
+        submitted text in values and gets a message in errors
+    """
+    values = {}
+    errors = {}
+    for field, convert in _CLIENTE_FORM_SPEC:
+        try:
+            values[field] = convert(form[field])
+        except ValueError:
+            values[field] = form[field]
+            errors[field] = 'Debe ser un número entero.'
+    return values, errors
+
+
+def _cliente_values(form):
+    """Cliente field values from _cliente_form().
+
+    Raises:
+        ValidationError: keyed by field, for every value that is not a valid number
+    """
+    values, errors = _convert_cliente_form(form)
+    if errors:
+        raise ValidationError(errors)
+    return values
+
+
+def _cliente_from_form(form, **kwargs):
+    """Unsaved Cliente holding the submitted values, to show the form again after an error."""
+    return Cliente(**_convert_cliente_form(form)[0], **kwargs)
+
+
+def _build_cliente(form):
+    """Unsaved, validated Cliente from _cliente_form() values.
+
+    Uniqueness is not checked here: the RFC unique index enforces it on save.
+
+    Raises:
+        ValidationError: if a number does not parse or the model validation fails
+    """
+    cliente = Cliente(**_cliente_values(form))
+    cliente.full_clean(validate_unique=False)
+    return cliente
+
+
+def _cliente_errors(exc):
+    """(error, field_errors) for clientes_form.html from a cliente ValidationError.
+
+    Field messages are shown next to their inputs; model-wide ones (the check
+    constraints) become the general error.
+    """
+    field_errors = exc.message_dict
+    general = field_errors.pop(NON_FIELD_ERRORS, [])
+    return ' '.join(general) or 'Revisa los campos marcados.', field_errors
+
+
+def _cliente_idem_key(request):
+    """Cache key for the submitted cliente form's idempotency token, if any.
+
+    The token is the uuid4 hex rendered into the form; anything else is ignored.
+    """
+    idem = request.POST.get('idem', '')
+    return f'redeco:cliente_idem:{idem}' if len(idem) == 32 and idem.isalnum() else None
+
+
 def require_token(view_func):
     """Decorator to require a saved redeco_token in session.
 
-    If token not present, redirect to index (login page) and store a
-    short message in session to show to the user.
+    TEMPORARY: while the REDECO API is unavailable, a request without a token
+    gets DUMMY_TOKEN_TEMP written into its session (a database write under the
+    cached_db session engine) instead of being redirected to the login page.
     """
     @wraps(view_func)
     def _wrapped(request, *args, **kwargs):
@@ -20,10 +345,9 @@ def require_token(view_func):
             token = 'DUMMY_TOKEN_TEMP'
         # Original code commented out while API is unavailable
         # if not token:
-        #     request.session['login_required_message'] = (
-        #         'Debes iniciar sesión antes de acceder a esta página.'
-        #     )
-        #     return redirect('redeco_frontend:login')
+        #     return redirect(reverse('redeco_frontend:login') + '?login_required=1')
+        # Expose the token to the view so it does not read the session again
+        request.redeco_token = token
         return view_func(request, *args, **kwargs)
 
     return _wrapped
@@ -33,7 +357,7 @@ def require_token(view_func):
 @require_token
 def index(request):
     """Dashboard page shown after login. Index is protected and requires token."""
-    token = request.session.get('redeco_token')
+    token = request.redeco_token
     # simple context: token present
     return render(request, 'index.html', {'token': token})
 
@@ -41,13 +365,8 @@ def index(request):
 @require_http_methods(['GET', 'POST'])
 def login_view(request):
     """Dedicated login page to obtain and store REDECO token in session."""
-    example = {
-        'username': 'UCISA',
-        'password': 'Ucisa.condusef.api_24',
-    }
-
     error = None
-    login_msg = request.session.pop('login_required_message', None)
+    login_msg = LOGIN_REQUIRED_MSG if request.GET.get('login_required') else None
 
     if request.method == 'POST':
         username = (request.POST.get('username') or '').strip()
@@ -64,168 +383,125 @@ def login_view(request):
             except services.RedeCoAPIError as exc:
                 error = str(exc)
 
-    return render(request, 'login.html', {'example': example, 'error': error, 'login_msg': login_msg})
+    return render(request, 'login.html', {'example': LOGIN_EXAMPLE, 'error': error, 'login_msg': login_msg})
 
 
 @require_http_methods(['POST'])
 def logout_view(request):
-    """Logout: remove token from session and redirect to login."""
-    request.session.pop('redeco_token', None)
+    """Logout: discard the session (token included) and redirect to login.
+
+    flush() deletes the stored session and clears the cookie instead of saving
+    an emptied session under the same key.
+    """
+    request.session.flush()
     return redirect('redeco_frontend:login')
 
 
 @require_http_methods(['GET'])
 @require_token
-def catalogs_medios(request):
-    """Fetch and display medios de recepción catalog (public endpoint, no token required)."""
+@cache_page(PUBLIC_PAGE_CACHE_TIMEOUT, key_prefix='cat')
+@vary_on_cookie
+@etag(_catalog_etag)
+def catalog_view(request, slug):
+    """Fetch and display a single public catalog (no token required).
+
+    Serves the catalogs listed in CATALOGS; urls.py routes each one here with
+    its slug so the existing URL names keep working.
+    """
+    path, template, keys, data_key = CATALOGS[slug]
     data = None
     error = None
 
     try:
         # Call the public endpoint
-        response = services.call_public_endpoint('catalogos/medio-recepcion')
-        # Normalizar posibles estructuras
-        medios_list = []
-        if isinstance(response, dict):
-            # Claves comunes observadas
-            for key in ('medio', 'medios', 'mediosRecepcion', 'mediosDeRecepcion'):
-                val = response.get(key)
-                if isinstance(val, list) and val:
-                    medios_list = val
-                    break
-            # A veces viene anidado en 'data'
-            if not medios_list and isinstance(response.get('data'), dict):
-                nested = response.get('data')
-                for key in ('medio', 'medios', 'mediosRecepcion', 'mediosDeRecepcion'):
-                    val = nested.get(key)
-                    if isinstance(val, list) and val:
-                        medios_list = val
-                        break
-            if not medios_list and isinstance(response.get('data'), list):
-                medios_list = response.get('data')
-        elif isinstance(response, list):
-            medios_list = response
-
-        data = {'medio': medios_list} if medios_list else response
+        response = services.get_public_catalog_cached(path, timeout_s=services.STATIC_CATALOG_CACHE_TIMEOUT)
+        data = response
+        if keys:
+            # Normalizar posibles estructuras (claves comunes, a veces anidado en 'data')
+            items = services.extract_list(response, keys)
+            if items:
+                data = {data_key: items}
     except services.RedeCoAPIError as exc:
         error = str(exc)
 
     context = {
         'data': data,
         'error': error,
-        'catalog_name': 'Medios de Recepción',
     }
-    return render(request, 'catalogs_medios.html', context)
+    return _render_catalog(request, template, context)
 
 
-@require_http_methods(['GET'])
-@require_token
-def catalogs_niveles_atencion(request):
-    """Fetch and display niveles de atención catalog (public endpoint, no token required)."""
-    data = None
-    error = None
+def _estados_with_lookup(path, params):
+    """Fetch the estados dropdown and, if params is given, a sepomex lookup.
 
-    try:
-        # Call the public endpoint
-        response = services.call_public_endpoint('catalogos/niveles-atencion')
-        data = response
-    except services.RedeCoAPIError as exc:
-        error = str(exc)
+    Both requests are independent, so they are issued concurrently instead of
+    one after the other.
 
-    context = {
-        'data': data,
-        'error': error,
-        'catalog_name': 'Niveles de Atención',
-    }
-    return render(request, 'catalogs_niveles_atencion.html', context)
-
-
-@require_http_methods(['GET'])
-@require_token
-def catalogs_estados(request):
-    """Fetch and display estados catalog (public endpoint, no token required)."""
+    Returns:
+        tuple: (estados, data, error); an error in the lookup takes precedence
+    """
+    estados = None
     data = None
     error = None
+    estados_future = services.submit(services.get_estados)
+    lookup_future = None
+    if params:
+        lookup_future = services.submit(services.get_public_catalog_cached, path, params=params)
 
     try:
-        # Call the public endpoint
-        response = services.call_public_endpoint('sepomex/estados/')
-        data = response
+        estados = estados_future.result().get('estados', [])
     except services.RedeCoAPIError as exc:
-        error = str(exc)
+        error = f"Error al cargar estados: {exc}"
 
-    context = {
-        'data': data,
-        'error': error,
-        'catalog_name': 'Estados',
-    }
-    return render(request, 'catalogs_estados.html', context)
+    if lookup_future is not None:
+        try:
+            data = lookup_future.result()
+        except services.RedeCoAPIError as exc:
+            error = str(exc)
+    return estados, data, error
 
 
 @require_http_methods(['GET'])
 @require_token
+@cache_page(PUBLIC_PAGE_CACHE_TIMEOUT, key_prefix='cat')
+@vary_on_cookie
+@etag(_sepomex_etag('sepomex/codigos-postales/', ('estado_id',)))
 def catalogs_codigos_postales(request):
     """Fetch and display códigos postales catalog (public endpoint, requires estado_id parameter)."""
-    data = None
-    error = None
-    estados = None
     selected_estado_id = request.GET.get('estado_id')
 
-    # Always fetch the list of states to show in the dropdown
-    try:
-        estados_response = services.call_public_endpoint('sepomex/estados/')
-        estados = estados_response.get('estados', [])
-    except services.RedeCoAPIError as exc:
-        error = f"Error al cargar estados: {str(exc)}"
-
-    # If an estado_id is selected, fetch the postal codes for that state
-    if selected_estado_id:
-        try:
-            response = services.call_public_endpoint(
-                'sepomex/codigos-postales/',
-                params={'estado_id': selected_estado_id}
-            )
-            data = response
-        except services.RedeCoAPIError as exc:
-            error = str(exc)
+    # Always fetch the list of states to show in the dropdown; if an estado_id
+    # is selected, fetch the postal codes for that state at the same time
+    estados, data, error = _estados_with_lookup(
+        'sepomex/codigos-postales/',
+        {'estado_id': selected_estado_id} if selected_estado_id else None
+    )
 
     context = {
         'data': data,
         'error': error,
         'estados': estados,
         'selected_estado_id': selected_estado_id,
-        'catalog_name': 'Códigos Postales',
     }
-    return render(request, 'catalogs_codigos_postales.html', context)
+    return _render_catalog(request, 'catalogs_codigos_postales.html', context)
 
 
 @require_http_methods(['GET'])
 @require_token
+@cache_page(PUBLIC_PAGE_CACHE_TIMEOUT, key_prefix='cat')
+@vary_on_cookie
+@etag(_sepomex_etag('sepomex/municipios/', ('estado_id', 'cp')))
 def catalogs_municipios(request):
     """Fetch and display municipios catalog (public endpoint, requires estado_id and cp parameters)."""
-    data = None
-    error = None
-    estados = None
     selected_estado_id = request.GET.get('estado_id')
     codigo_postal = request.GET.get('cp')
 
-    # Always fetch the list of states to show in the dropdown
-    try:
-        estados_response = services.call_public_endpoint('sepomex/estados/')
-        estados = estados_response.get('estados', [])
-    except services.RedeCoAPIError as exc:
-        error = f"Error al cargar estados: {str(exc)}"
-
-    # If both estado_id and cp are provided, fetch the municipios
-    if selected_estado_id and codigo_postal:
-        try:
-            response = services.call_public_endpoint(
-                'sepomex/municipios/',
-                params={'estado_id': selected_estado_id, 'cp': codigo_postal}
-            )
-            data = response
-        except services.RedeCoAPIError as exc:
-            error = str(exc)
+    # If both estado_id and cp are provided, fetch the municipios alongside
+    # the states dropdown
+    estados, data, error = _estados_with_lookup(
+        'sepomex/municipios/',
+        {'estado_id': selected_estado_id, 'cp': codigo_postal} if selected_estado_id and codigo_postal else None
+    )
 
     context = {
         'data': data,
@@ -233,13 +509,15 @@ def catalogs_municipios(request):
         'estados': estados,
         'selected_estado_id': selected_estado_id,
         'codigo_postal': codigo_postal,
-        'catalog_name': 'Municipios',
     }
-    return render(request, 'catalogs_municipios.html', context)
+    return _render_catalog(request, 'catalogs_municipios.html', context)
 
 
 @require_http_methods(['GET'])
 @require_token
+@cache_page(PUBLIC_PAGE_CACHE_TIMEOUT, key_prefix='cat')
+@vary_on_cookie
+@etag(_sepomex_etag('sepomex/colonias/', ('cp',), with_estados=False))
 def catalogs_colonias(request):
     """Fetch and display colonias catalog (public endpoint, requires cp parameter)."""
     data = None
@@ -249,7 +527,7 @@ def catalogs_colonias(request):
     # If cp is provided, fetch the colonias
     if codigo_postal:
         try:
-            response = services.call_public_endpoint(
+            response = services.get_public_catalog_cached(
                 'sepomex/colonias/',
                 params={'cp': codigo_postal}
             )
@@ -261,138 +539,89 @@ def catalogs_colonias(request):
         'data': data,
         'error': error,
         'codigo_postal': codigo_postal,
-        'catalog_name': 'Colonias',
     }
-    return render(request, 'catalogs_colonias.html', context)
+    return _render_catalog(request, 'catalogs_colonias.html', context)
 
 
 @require_http_methods(['GET'])
 @require_token
+@cache_page(PROTECTED_PAGE_CACHE_TIMEOUT)
+@vary_on_cookie
 def catalogs_productos(request):
     """Fetch and display productos catalog (protected endpoint requiring token)."""
-    token = request.session.get('redeco_token')
+    token = request.redeco_token
     data = None
     error = None
-    raw_response = None
 
-    if not token:
-        error = 'Token no disponible. Genera un token desde la página principal.'
-    else:
-        try:
-            response = services.call_protected_endpoint(
-                'catalogos/products-list',
-                token
-            )
-            # Normalizar respuesta de productos
-            productos = []
-            if isinstance(response, dict):
-                for key in ('products', 'productos', 'productsList', 'listaProductos'):
-                    val = response.get(key)
-                    if isinstance(val, list) and val:
-                        productos = val
-                        break
-                if not productos and isinstance(response.get('data'), dict):
-                    nested = response.get('data')
-                    for key in ('products', 'productos', 'productsList', 'listaProductos'):
-                        val = nested.get(key)
-                        if isinstance(val, list) and val:
-                            productos = val
-                            break
-                if not productos and isinstance(response.get('data'), list):
-                    productos = response.get('data')
-            elif isinstance(response, list):
-                productos = response
-            productos = productos or []
-            data = {'products': productos} if productos else response
-            import json
-            raw_response = json.dumps(response, indent=2, ensure_ascii=False)
-        except services.RedeCoAPIError as exc:
-            error = str(exc)
+    try:
+        response = services.call_protected_cached(
+            'catalogos/products-list',
+            token
+        )
+        # Normalizar respuesta de productos
+        productos = services.extract_list(response, services.PRODUCTO_KEYS)
+        data = {'products': productos} if productos else response
+    except services.RedeCoAPIError as exc:
+        error = str(exc)
 
     context = {
         'token': token,
         'data': data,
         'error': error,
-        'raw_response': raw_response,
-        'catalog_name': 'Productos',
     }
     return render(request, 'catalogs_productos.html', context)
 
 
 @require_http_methods(['GET'])
 @require_token
+def catalogs_productos_raw(request):
+    """Return the raw products-list response as pretty-printed JSON.
+
+    Only requested by the "Ver Response Crudo (JSON)" modal when it is opened,
+    so the productos page itself never serializes the payload a second time.
+    """
+    token = request.redeco_token
+    try:
+        response = services.call_protected_cached('catalogos/products-list', token)
+    except services.RedeCoAPIError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return HttpResponse(_pretty_json(response), content_type='application/json')
+
+
+@require_http_methods(['GET'])
+@require_token
+@cache_page(PROTECTED_PAGE_CACHE_TIMEOUT)
+@vary_on_headers('Cookie', 'X-Requested-With')  # HTML y JSON (AJAX) comparten URL
 def catalogs_causas(request):
     """Fetch and display causas catalog (protected endpoint requiring token)."""
-    from django.http import JsonResponse
-    
-    token = request.session.get('redeco_token')
+    token = request.redeco_token
     product = request.GET.get('product', '')  # Get from query param, no default
     data = None
     error = None
     productos = []
+    # create_queja pide las causas por AJAX y sólo necesita la lista de causas
+    is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+
+    # productos (for the dropdown) se pide en paralelo con las causas
+    prod_future = None if is_ajax else services.submit(services.get_productos, token)
 
-    if not token:
-        error = 'Token no disponible. Genera un token desde la página principal.'
-    else:
-        # Load productos list for the dropdown
-        try:
-            response = services.call_protected_endpoint(
-                'catalogos/products-list',
-                token
-            )
-            if isinstance(response, dict):
-                for key in ('products', 'productos', 'productsList', 'listaProductos'):
-                    val = response.get(key)
-                    if isinstance(val, list) and val:
-                        productos = val
-                        break
-                if not productos and isinstance(response.get('data'), dict):
-                    nested = response.get('data')
-                    for key in ('products', 'productos', 'productsList', 'listaProductos'):
-                        val = nested.get(key)
-                        if isinstance(val, list) and val:
-                            productos = val
-                            break
-                if not productos and isinstance(response.get('data'), list):
-                    productos = response.get('data')
-            elif isinstance(response, list):
-                productos = response
-            productos = productos or []
-        except services.RedeCoAPIError:
-            pass  # productos remains empty list
-        
     if product:  # Only call API if product is provided
         try:
-            response = services.call_protected_endpoint(
+            response = services.call_protected_cached(
                 'catalogos/causas-list/',
                 token,
                 params={'product': product}
             )
-            causas = []
-            if isinstance(response, dict):
-                for key in ('causas', 'causasList', 'listaCausas'):
-                    val = response.get(key)
-                    if isinstance(val, list) and val:
-                        causas = val
-                        break
-                if not causas and isinstance(response.get('data'), dict):
-                    nested = response.get('data')
-                    for key in ('causas', 'causasList', 'listaCausas'):
-                        val = nested.get(key)
-                        if isinstance(val, list) and val:
-                            causas = val
-                            break
-                if not causas and isinstance(response.get('data'), list):
-                    causas = response.get('data')
-            elif isinstance(response, list):
-                causas = response
-            causas = causas or []
+            causas = services.extract_list(response, services.CAUSA_KEYS)
             data = {'causas': causas} if causas else response
         except services.RedeCoAPIError as exc:
             error = str(exc)
 
+    if prod_future is not None:
+        productos = prod_future.result()
+
     # If AJAX request, return JSON
-    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+    if is_ajax:
         if error:
             return JsonResponse({'error': error}, status=400)
         return JsonResponse(data if data else {'causas': []})
@@ -402,7 +631,6 @@ def catalogs_causas(request):
         'token': token,
         'productos': productos,
         'product': product,
-        'product': product,
         'data': data,
         'error': error,
     }
@@ -410,12 +638,10 @@ def catalogs_causas(request):
 
 
 @require_http_methods(['GET', 'POST'])
+@require_token
 def reune_consultas(request):
     """Submit consultas to REUNE API (POST to /reune/consultas/general)."""
-    import json
-    from datetime import datetime
-    
-    token = request.session.get('redeco_token')
+    token = request.redeco_token
     result = None
     error = None
     form = {}
@@ -426,153 +652,114 @@ def reune_consultas(request):
     estados = []
     
     try:
-        med_resp = services.call_public_endpoint('catalogos/medio-recepcion')
-        if isinstance(med_resp, dict):
-            for key in ('medios', 'medio', 'mediosRecepcion', 'mediosDeRecepcion'):
-                val = med_resp.get(key)
-                if isinstance(val, list) and val:
-                    medios = val
-                    break
-        elif isinstance(med_resp, list):
-            medios = med_resp
+        med_resp = services.get_public_catalog_cached(
+            'catalogos/medio-recepcion', timeout_s=services.STATIC_CATALOG_CACHE_TIMEOUT
+        )
+        medios = services.extract_list(med_resp, services.MEDIO_KEYS)
     except Exception:
         pass
 
     try:
-        niv_resp = services.call_public_endpoint('catalogos/nivel-atencion')
-        if isinstance(niv_resp, dict):
-            for key in ('niveles', 'nivel', 'nivelesAtencion', 'nivelesDeAtencion'):
-                val = niv_resp.get(key)
-                if isinstance(val, list) and val:
-                    niveles = val
-                    break
-        elif isinstance(niv_resp, list):
-            niveles = niv_resp
+        niv_resp = services.get_public_catalog_cached(
+            'catalogos/nivel-atencion', timeout_s=services.STATIC_CATALOG_CACHE_TIMEOUT
+        )
+        niveles = services.extract_list(niv_resp, services.NIVEL_KEYS)
     except Exception:
         pass
 
     try:
-        est_resp = services.call_public_endpoint('sepomex/estados')
-        if isinstance(est_resp, dict):
-            for key in ('estados', 'estado', 'data'):
-                val = est_resp.get(key)
-                if isinstance(val, list) and val:
-                    estados = val
-                    break
-        elif isinstance(est_resp, list):
-            estados = est_resp
+        est_resp = services.get_estados()
+        estados = services.extract_list(est_resp, services.ESTADO_KEYS)
     except Exception:
         pass
     
     if request.method == 'POST':
-        if not token:
-            error = 'Token no disponible. Genera un token desde la página principal.'
+        # Capture form data
+        form = {f: (request.POST.get(f) or '').strip() for f in _REUNE_POST_FIELDS}
+        
+        # Validate required fields
+        estatus = form.get('consultas_estatus_con', '')
+        medio_id = form.get('medios_id', '')
+        
+        required_fields = [
+            'institucion_clave', 'sector', 'consultas_trim', 'num_consultas',
+            'consultas_folio', 'consultas_estatus_con', 'consultas_fec_recepcion',
+            'consultas_pori', 'medios_id', 'producto', 'causa_id',
+            'estados_id', 'consultas_mpio_id'
+        ]
+        
+        # Fecha de atención y nivel requeridos solo si estatus = 2 (Concluido)
+        if estatus == '2':
+            required_fields.extend(['consultas_fec_aten', 'consultas_cat_nivel_aten_id'])
+        
+        # CP requerido para UNE (1), Sucursal (2), Oficina (4)
+        if medio_id in _MEDIOS_CON_CP:
+            required_fields.append('consultas_cp')
+        
+        missing = [f for f in required_fields if not form.get(f)]
+        if missing:
+            error = f'Faltan campos requeridos: {", ".join(missing)}'
         else:
-            # Capture form data
-            form = {
-                'institucion_clave': request.POST.get('institucion_clave', '').strip(),
-                'sector': request.POST.get('sector', '').strip(),
-                'consultas_trim': request.POST.get('consultas_trim', '').strip(),
-                'num_consultas': request.POST.get('num_consultas', '').strip(),
-                'consultas_folio': request.POST.get('consultas_folio', '').strip(),
-                'consultas_estatus_con': request.POST.get('consultas_estatus_con', '').strip(),
-                'consultas_fec_aten': request.POST.get('consultas_fec_aten', '').strip(),
-                'consultas_fec_recepcion': request.POST.get('consultas_fec_recepcion', '').strip(),
-                'consultas_pori': request.POST.get('consultas_pori', '').strip(),
-                'medios_id': request.POST.get('medios_id', '').strip(),
-                'consultas_cat_nivel_aten_id': request.POST.get('consultas_cat_nivel_aten_id', '').strip(),
-                'producto': request.POST.get('producto', '').strip(),
-                'causa_id': request.POST.get('causa_id', '').strip(),
-                'estados_id': request.POST.get('estados_id', '').strip(),
-                'consultas_cp': request.POST.get('consultas_cp', '').strip(),
-                'consultas_mpio_id': request.POST.get('consultas_mpio_id', '').strip(),
-                'consultas_loc_id': request.POST.get('consultas_loc_id', '').strip(),
-                'consultas_col_id': request.POST.get('consultas_col_id', '').strip(),
-            }
-            
-            # Validate required fields
-            estatus = form.get('consultas_estatus_con', '')
-            medio_id = form.get('medios_id', '')
-            
-            required_fields = [
-                'institucion_clave', 'sector', 'consultas_trim', 'num_consultas',
-                'consultas_folio', 'consultas_estatus_con', 'consultas_fec_recepcion',
-                'consultas_pori', 'medios_id', 'producto', 'causa_id',
-                'estados_id', 'consultas_mpio_id'
-            ]
-            
-            # Fecha de atención y nivel requeridos solo si estatus = 2 (Concluido)
-            if estatus == '2':
-                required_fields.extend(['consultas_fec_aten', 'consultas_cat_nivel_aten_id'])
-            
-            # CP requerido para UNE (1), Sucursal (2), Oficina (4)
-            if medio_id in ['1', '2', '4']:
-                required_fields.append('consultas_cp')
-            
-            missing = [f for f in required_fields if not form.get(f)]
-            if missing:
-                error = f'Faltan campos requeridos: {", ".join(missing)}'
-            else:
-                try:
-                    # Convert dates from YYYY-MM-DD to DD/MM/YYYY
-                    fec_recepcion = datetime.strptime(form['consultas_fec_recepcion'], '%Y-%m-%d').strftime('%d/%m/%Y')
-                    
-                    # Build payload as array with single consulta
-                    payload = [{
-                        "InstitucionClave": form['institucion_clave'],
-                        "Sector": form['sector'],
-                        "ConsultasTrim": int(form['consultas_trim']),
-                        "NumConsultas": 1,  # Siempre 1 según disposición
-                        "ConsultasFolio": form['consultas_folio'],
-                        "ConsultasEstatusCon": int(estatus),
-                        "EstadosId": int(form['estados_id']),
-                        "ConsultasFecRecepcion": fec_recepcion,
-                        "MediosId": int(medio_id),
-                        "Producto": form['producto'],
-                        "CausaId": form['causa_id'],
-                        "ConsultasMpioId": int(form['consultas_mpio_id']),
-                        "ConsultasPori": form['consultas_pori']
-                    }]
-                    
-                    # Agregar campos opcionales si están presentes
-                    if form.get('consultas_fec_aten'):
-                        fec_aten = datetime.strptime(form['consultas_fec_aten'], '%Y-%m-%d').strftime('%d/%m/%Y')
-                        payload[0]["ConsultasFecAten"] = fec_aten
-                    else:
-                        payload[0]["ConsultasFecAten"] = None  # null sin comillas
-                    
-                    if form.get('consultas_cat_nivel_aten_id'):
-                        payload[0]["ConsultascatnivelatenId"] = int(form['consultas_cat_nivel_aten_id'])
-                    else:
-                        payload[0]["ConsultascatnivelatenId"] = None  # null sin comillas
-                    
-                    if form.get('consultas_cp'):
-                        payload[0]["ConsultasCP"] = int(form['consultas_cp'])
-                    else:
-                        payload[0]["ConsultasCP"] = None  # null sin comillas
-                    
-                    if form.get('consultas_loc_id'):
-                        payload[0]["ConsultasLocId"] = int(form['consultas_loc_id'])
-                    else:
-                        payload[0]["ConsultasLocId"] = None  # null sin comillas
-                    
-                    if form.get('consultas_col_id'):
-                        payload[0]["ConsultasColId"] = int(form['consultas_col_id'])
-                    else:
-                        payload[0]["ConsultasColId"] = None  # null sin comillas
-                    
-                    # Call REUNE API
-                    result = services.post_reune_consultas_general(token, payload)
+            try:
+                # Convert dates from YYYY-MM-DD to DD/MM/YYYY
+                fec_recepcion = datetime.strptime(form['consultas_fec_recepcion'], '%Y-%m-%d').strftime('%d/%m/%Y')
+                
+                # Build payload as array with single consulta
+                payload = [{
+                    "InstitucionClave": form['institucion_clave'],
+                    "Sector": form['sector'],
+                    "ConsultasTrim": int(form['consultas_trim']),
+                    "NumConsultas": 1,  # Siempre 1 según disposición
+                    "ConsultasFolio": form['consultas_folio'],
+                    "ConsultasEstatusCon": int(estatus),
+                    "EstadosId": int(form['estados_id']),
+                    "ConsultasFecRecepcion": fec_recepcion,
+                    "MediosId": int(medio_id),
+                    "Producto": form['producto'],
+                    "CausaId": form['causa_id'],
+                    "ConsultasMpioId": int(form['consultas_mpio_id']),
+                    "ConsultasPori": form['consultas_pori']
+                }]
+                
+                # Agregar campos opcionales si están presentes
+                if form.get('consultas_fec_aten'):
+                    fec_aten = datetime.strptime(form['consultas_fec_aten'], '%Y-%m-%d').strftime('%d/%m/%Y')
+                    payload[0]["ConsultasFecAten"] = fec_aten
+                else:
+                    payload[0]["ConsultasFecAten"] = None  # null sin comillas
+                
+                if form.get('consultas_cat_nivel_aten_id'):
+                    payload[0]["ConsultascatnivelatenId"] = int(form['consultas_cat_nivel_aten_id'])
+                else:
+                    payload[0]["ConsultascatnivelatenId"] = None  # null sin comillas
+                
+                if form.get('consultas_cp'):
+                    payload[0]["ConsultasCP"] = int(form['consultas_cp'])
+                else:
+                    payload[0]["ConsultasCP"] = None  # null sin comillas
+                
+                if form.get('consultas_loc_id'):
+                    payload[0]["ConsultasLocId"] = int(form['consultas_loc_id'])
+                else:
+                    payload[0]["ConsultasLocId"] = None  # null sin comillas
+                
+                if form.get('consultas_col_id'):
+                    payload[0]["ConsultasColId"] = int(form['consultas_col_id'])
+                else:
+                    payload[0]["ConsultasColId"] = None  # null sin comillas
+                
+                # Call REUNE API
+                result = services.post_reune_consultas_general(token, payload)
+                
+                # Clear form on success
+                if result and not error:
+                    form = {}
                     
-                    # Clear form on success
-                    if result and not error:
-                        form = {}
-                        
-                except ValueError as e:
-                    error = f'Error en formato de datos: {str(e)}'
-                except services.RedeCoAPIError as exc:
-                    error = str(exc)
-    
+            except ValueError as e:
+                error = f'Error en formato de datos: {e}'
+            except services.RedeCoAPIError as exc:
+                error = str(exc)
+
     context = {
         'token': token,
         'result': result,
@@ -593,7 +780,7 @@ def reune_consultar_folios(request):
     page = request.GET.get('page', '1')
     
     if not token:
-        error = 'Token no disponible. Genera un token desde la página principal.'
+        error = ERR_NO_TOKEN
     else:
         try:
             # Consultar total o página específica
@@ -622,7 +809,7 @@ def reune_eliminar_folio(request):
     
     if request.method == 'POST':
         if not token:
-            error = 'Token no disponible. Genera un token desde la página principal.'
+            error = ERR_NO_TOKEN
         else:
             folio = request.POST.get('folio', '').strip()
             
@@ -654,243 +841,65 @@ def create_queja(request):
     POST: validate form fields, build the payload expected by the REDECO API and
     call services.create_queja(token, payload).
     """
-    import json
-    from datetime import datetime
 
     error = None
     success = None
     payload_sent = None
     form = {}
     
-    # Calculate current month automatically
-    current_month = datetime.now().month
-    
     # Calculate current month automatically
     current_month = datetime.now().month
 
-    # Fetch catalogs for the form selects
-    medios = []
-    niveles = []
-    estados = []
-    productos = []
     clientes = Cliente.objects.all().order_by('nombre')  # Agregar catálogo de clientes
+    token = request.redeco_token
 
-    try:
-        med_resp = services.call_public_endpoint('catalogos/medio-recepcion')
-        # Normalización ampliada de posibles claves
-        if isinstance(med_resp, dict):
-            for key in ('medios', 'medio', 'mediosRecepcion', 'mediosDeRecepcion'):
-                val = med_resp.get(key)
-                if isinstance(val, list) and val:
-                    medios = val
-                    break
-            if not medios and isinstance(med_resp.get('data'), dict):
-                nested = med_resp.get('data')
-                for key in ('medios', 'medio', 'mediosRecepcion', 'mediosDeRecepcion'):
-                    val = nested.get(key)
-                    if isinstance(val, list) and val:
-                        medios = val
-                        break
-            if not medios and isinstance(med_resp.get('data'), list):
-                medios = med_resp.get('data')
-        elif isinstance(med_resp, list):
-            medios = med_resp
-        medios = medios or []
-    except services.RedeCoAPIError:
-        # non-fatal: form still rendered without medios
-        medios = []
-
-    try:
-        niv_resp = services.call_public_endpoint('catalogos/niveles-atencion')
-        if isinstance(niv_resp, dict):
-            if 'niveles' in niv_resp:
-                niveles = niv_resp.get('niveles') or []
-            elif 'nivelesDeAtencion' in niv_resp:
-                niveles = niv_resp.get('nivelesDeAtencion') or []
-            else:
-                data_section = niv_resp.get('data')
-                if isinstance(data_section, dict):
-                    if 'niveles' in data_section:
-                        niveles = data_section.get('niveles') or []
-                    elif 'nivelesDeAtencion' in data_section:
-                        niveles = data_section.get('nivelesDeAtencion') or []
-                elif isinstance(data_section, list):
-                    niveles = data_section
-        elif isinstance(niv_resp, list):
-            niveles = niv_resp
-        niveles = niveles or []
-    except services.RedeCoAPIError:
-        niveles = []
-
-    try:
-        est_resp = services.call_public_endpoint('sepomex/estados/')
-        estados = est_resp.get('estados') if isinstance(est_resp, dict) else []
-        estados = estados or []
-    except services.RedeCoAPIError:
-        estados = []
-
-    token = request.session.get('redeco_token')
-
-    # Productos catalog (protected, requires token)
-    if token:
-        try:
-            prod_resp = services.call_protected_endpoint('catalogos/products-list', token)
-            if isinstance(prod_resp, dict):
-                for key in ('products', 'productos', 'productsList', 'listaProductos'):
-                    val = prod_resp.get(key)
-                    if isinstance(val, list) and val:
-                        productos = val
-                        break
-                if not productos and isinstance(prod_resp.get('data'), dict):
-                    nested = prod_resp.get('data')
-                    for key in ('products', 'productos', 'productsList', 'listaProductos'):
-                        val = nested.get(key)
-                        if isinstance(val, list) and val:
-                            productos = val
-                            break
-                if not productos and isinstance(prod_resp.get('data'), list):
-                    productos = prod_resp.get('data')
-            elif isinstance(prod_resp, list):
-                productos = prod_resp
-        except services.RedeCoAPIError:
-            productos = []
+    # Catalogs for the form selects (medios, niveles, estados, productos)
+    catalogs = services.get_form_catalogs(token)
 
     if request.method == 'POST':
         # Collect all form fields per REDECO spec
-        no_trim = (request.POST.get('no_trim') or '').strip()
-        quejas_num = (request.POST.get('quejas_num') or '1').strip()
-        folio = (request.POST.get('folio') or '').strip()
-        fecha_recepcion = (request.POST.get('fecha_recepcion') or '').strip()
-        medio_id = (request.POST.get('medio_id') or '').strip()
-        nivel_id = (request.POST.get('nivel_id') or '').strip()
-        producto = (request.POST.get('producto') or '').strip()
-        causas_id = (request.POST.get('causas_id') or '').strip()
-        pori = (request.POST.get('pori') or '').strip().upper()
-        estatus = (request.POST.get('estatus') or '').strip()
-        
+        form = {f: (request.POST.get(f) or '').strip() for f in _QUEJA_POST_FIELDS}
+        form['quejas_num'] = (request.POST.get('quejas_num') or '1').strip()
+        form['pori'] = form['pori'].upper()
+
         # Datos del cliente - DEBE venir del catálogo obligatoriamente
-        cliente_id = (request.POST.get('cliente_id') or '').strip()
-        if not cliente_id:
+        # (se guardan en form para volver a mostrar el formulario tras un error)
+        form.update(dict.fromkeys(_QUEJA_CLIENTE_FIELDS, ''))
+        if not form['cliente_id']:
             error = 'Debe seleccionar un cliente del catálogo. Si el cliente no existe, créelo primero.'
         else:
             try:
-                cliente = Cliente.objects.get(id=cliente_id)
-                estado_id = str(cliente.estado_id)
-                municipio = str(cliente.municipio_id) if cliente.municipio_id else ''
-                colonia = str(cliente.colonia_id) if cliente.colonia_id else ''
-                cp = cliente.codigo_postal
-                localidad = cliente.localidad or ''
-                tipo_persona = str(cliente.tipo_persona)
-                sexo = cliente.sexo or ''
-                edad = str(cliente.edad) if cliente.edad else ''
+                cliente = Cliente.objects.get(id=form['cliente_id'])
+                form.update({
+                    'estado_id': str(cliente.estado_id),
+                    'municipio': str(cliente.municipio_id) if cliente.municipio_id else '',
+                    'colonia': str(cliente.colonia_id) if cliente.colonia_id else '',
+                    'cp': cliente.codigo_postal,
+                    'localidad': cliente.localidad or '',
+                    'tipo_persona': str(cliente.tipo_persona),
+                    'sexo': cliente.sexo or '',
+                    'edad': str(cliente.edad) if cliente.edad else '',
+                })
             except Cliente.DoesNotExist:
                 error = 'El cliente seleccionado no existe. Por favor, seleccione un cliente válido.'
-                estado_id = ''
-                municipio = ''
-                colonia = ''
-                cp = ''
-                localidad = ''
-                tipo_persona = ''
-                sexo = ''
-                edad = ''
-        
-        fecha_resolucion = (request.POST.get('fecha_resolucion') or '').strip()
-        fecha_notificacion = (request.POST.get('fecha_notificacion') or '').strip()
-        respuesta = (request.POST.get('respuesta') or '').strip()
-        num_penal = (request.POST.get('num_penal') or '').strip()
-        penalizacion_id = (request.POST.get('penalizacion_id') or '').strip()
-
-        # Preserve submitted values to re-render the form after errors
-        form = {
-            'no_trim': no_trim,
-            'quejas_num': quejas_num,
-            'folio': folio,
-            'fecha_recepcion': fecha_recepcion,
-            'medio_id': medio_id,
-            'nivel_id': nivel_id,
-            'producto': producto,
-            'causas_id': causas_id,
-            'pori': pori,
-            'estatus': estatus,
-            'cliente_id': cliente_id,
-            'estado_id': estado_id,
-            'municipio': municipio,
-            'localidad': localidad,
-            'colonia': colonia,
-            'cp': cp,
-            'tipo_persona': tipo_persona,
-            'sexo': sexo,
-            'edad': edad,
-            'fecha_resolucion': fecha_resolucion,
-            'fecha_notificacion': fecha_notificacion,
-            'respuesta': respuesta,
-            'num_penal': num_penal,
-            'penalizacion_id': penalizacion_id,
-        }
 
         # Enhanced validation per REDECO requirements
         if error:
             # Ya hay un error (cliente no seleccionado o no válido)
             pass
-        elif not all([no_trim, folio, fecha_recepcion, medio_id, nivel_id, producto, causas_id, pori, estatus, estado_id, municipio, colonia, cp, tipo_persona]):
+        elif not all(form[f] for f in _QUEJA_REQUIRED_FIELDS):
             error = 'Todos los campos marcados como requeridos deben ser completados.'
-        elif pori not in ['SI', 'NO']:
+        elif form['pori'] not in _PORI_VALID:
             error = 'PORI debe ser "SI" o "NO" (mayúsculas).'
-        elif estatus not in ['1', '2']:
+        elif form['estatus'] not in _ESTATUS_VALID:
             error = 'Estado debe ser 1 (Pendiente) o 2 (Concluido).'
-        elif not token:
-            error = 'Token no disponible. Genera un token desde la página principal.'
         else:
-            # helper to convert html date (YYYY-MM-DD) to dd/mm/yyyy as used in API
-            def _fmt_date(d):
-                if not d:
-                    return None
-                try:
-                    # Accept YYYY-MM-DD or already dd/mm/yyyy
-                    if '-' in d:
-                        dt = datetime.strptime(d, '%Y-%m-%d')
-                        return dt.strftime('%d/%m/%Y')
-                    # try parsing dd/mm/yyyy
-                    dt = datetime.strptime(d, '%d/%m/%Y')
-                    return dt.strftime('%d/%m/%Y')
-                except Exception:
-                    return d
-
-            payload = {
-                'QuejasNoTrim': int(no_trim),
-                'QuejasNum': int(quejas_num) if quejas_num.isdigit() else 1,
-                'QuejasFolio': folio,
-                'QuejasFecRecepcion': _fmt_date(fecha_recepcion),
-                'MedioId': int(medio_id) if medio_id.isdigit() else medio_id,
-                'NivelATId': int(nivel_id) if nivel_id.isdigit() else nivel_id,
-                'product': producto,
-                'CausasId': str(causas_id),  # Mantener como string
-                'QuejasPORI': pori,
-                'QuejasEstatus': int(estatus) if estatus.isdigit() else estatus,
-                'EstadosId': int(estado_id) if estado_id.isdigit() else estado_id,
-                'QuejasMunId': int(municipio) if municipio.isdigit() else municipio,  # Debe ser numérico
-                'QuejasColId': int(colonia) if colonia.isdigit() else colonia,  # Debe ser numérico
-                'QuejasCP': int(cp) if cp.isdigit() else cp,  # Debe ser numérico
-                'QuejasTipoPersona': int(tipo_persona) if tipo_persona.isdigit() else tipo_persona,
-            }
-            
-            # Campos opcionales - solo agregar si tienen valor
-            if localidad and localidad.isdigit():
-                payload['QuejasLocId'] = int(localidad)
-            if sexo:
-                payload['QuejasSexo'] = sexo
-            if edad and edad.isdigit():
-                payload['QuejasEdad'] = int(edad)
-            if fecha_resolucion:
-                payload['QuejasFecResolucion'] = _fmt_date(fecha_resolucion)
-            if fecha_notificacion:
-                payload['QuejasFecNotificacion'] = _fmt_date(fecha_notificacion)
-            if respuesta and respuesta.isdigit():
-                payload['QuejasRespuesta'] = int(respuesta)
-            if num_penal and num_penal.isdigit() and int(num_penal) > 0:
-                payload['QuejasNumPenal'] = int(num_penal)
-            if penalizacion_id and penalizacion_id.isdigit():
-                payload['PenalizacionId'] = int(penalizacion_id)
+            # Campos opcionales - solo se agregan si tienen valor (conv devuelve None)
+            payload = {}
+            for field, key, conv in _QUEJA_PAYLOAD_SPEC:
+                value = conv(form[field])
+                if value is not None:
+                    payload[key] = value
 
             try:
                 result = services.create_queja(token, payload)
@@ -912,21 +921,18 @@ def create_queja(request):
                 else:
                     success = 'Queja enviada correctamente.'
                 
-                payload_sent = json.dumps({
+                payload_sent = _pretty_json({
                     'PAYLOAD_ENVIADO': payload,
                     'RESPUESTA_API': result
-                }, ensure_ascii=False, indent=2)
+                }).decode()
             except services.RedeCoAPIError as exc:
                 error = str(exc)
-                payload_sent = json.dumps(payload, ensure_ascii=False, indent=2)
+                payload_sent = _pretty_json(payload).decode()
 
     context = {
         'error': error,
         'success': success,
-        'medios': medios,
-        'niveles': niveles,
-        'estados': estados,
-        'productos': productos,
+        **catalogs,
         'clientes': clientes,
         'payload_text': payload_sent,
         'current_month': current_month,
@@ -942,15 +948,13 @@ def create_queja(request):
 
 @require_http_methods(['GET'])
 @require_token
+@etag(_clientes_list_etag)
 def clientes_list(request):
-    """Lista de todos los clientes con filtros y ordenamiento."""
-    clientes = Cliente.objects.all()
-    
-    # Capturar mensajes de sesión y limpiarlos
-    create_success = request.session.pop('create_success', None)
-    update_success = request.session.pop('update_success', None)
-    delete_success = request.session.pop('delete_success', None)
-    delete_error = request.session.pop('delete_error', None)
+    """Lista de todos los clientes con filtros, ordenamiento y paginación."""
+    clientes = Cliente.objects.only(*CLIENTE_LIST_FIELDS)
+    if CLIENTE_FK_FIELDS:
+        # select_related() sin argumentos seguiría todas las FK, por eso el guard
+        clientes = clientes.select_related(*CLIENTE_FK_FIELDS)
     
     # Filtros
     rfc_filter = request.GET.get('rfc', '').strip()
@@ -978,16 +982,21 @@ def clientes_list(request):
     else:
         clientes = clientes.order_by('-id')
     
+    # Paginación: Paginator usa COUNT(*) en SQL, no materializa el queryset
+    paginator = Paginator(clientes, CLIENTES_PER_PAGE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    querystring = request.GET.copy()
+    querystring.pop('page', None)
+    
     # Obtener listas únicas para los filtros
     estados_disponibles = Cliente.objects.exclude(estado_id__isnull=True).values('estado_id', 'estado_nombre').distinct().order_by('estado_nombre')
     municipios_disponibles = Cliente.objects.exclude(municipio_id__isnull=True).values('municipio_id', 'municipio_nombre').distinct().order_by('municipio_nombre')
     
     context = {
-        'clientes': clientes,
-        'create_success': create_success,
-        'update_success': update_success,
-        'delete_success': delete_success,
-        'delete_error': delete_error,
+        'clientes': page_obj,
+        'page_obj': page_obj,
+        'total': paginator.count,
+        'querystring': querystring.urlencode(),
         'rfc_filter': rfc_filter,
         'tipo_filter': tipo_filter,
         'estado_filter': estado_filter,
@@ -1004,88 +1013,65 @@ def clientes_list(request):
 @require_token
 def clientes_create(request):
     """Crear un nuevo cliente."""
-    token = request.session.get('redeco_token')
+    token = request.redeco_token
     error = None
+    field_errors = {}
     success = None
     form_data = {}
     
-    # Cargar catálogos necesarios
+    if request.method == 'POST':
+        idem_key = _cliente_idem_key(request)
+        # La clave se reclama antes de guardar (cache.add es atómico), así dos
+        # envíos simultáneos del mismo formulario no crean dos clientes
+        if idem_key and not cache.add(idem_key, 1, CLIENTE_IDEM_TIMEOUT):
+            # Reenvío de un formulario que ya se guardó o se está guardando
+            return redirect('redeco_frontend:clientes_list')
+        
+        # Recoger datos del formulario (también sirven para repoblarlo si hay error)
+        form_data = _cliente_form(request.POST)
+        nombre, rfc = form_data['nombre'], form_data['rfc']
+        
+        saved = False
+        try:
+            # Validaciones
+            if not all(form_data[f] for f in _CLIENTE_REQUIRED_FIELDS):
+                error = 'Los campos marcados con * son obligatorios.'
+            else:
+                try:
+                    # El RFC duplicado lo detecta el índice único al guardar
+                    # (sin SELECT previo y sin carreras)
+                    cliente = _build_cliente(form_data)
+                    with transaction.atomic():
+                        cliente.save()
+                    saved = True
+                except IntegrityError:
+                    error = f'Ya existe un cliente con el RFC {rfc}.'
+                    field_errors = {'rfc': [error]}
+                except ValidationError as e:
+                    error, field_errors = _cliente_errors(e)
+        finally:
+            if idem_key and not saved:
+                # No se guardó: liberar la clave para poder reenviar el formulario
+                cache.delete(idem_key)
+        if saved:
+            messages.success(request, f'Cliente {nombre} creado exitosamente.')
+            return redirect('redeco_frontend:clientes_list')
+    
+    # Cargar catálogos sólo si se va a mostrar el formulario (no tras guardar)
     estados = []
     try:
-        estados_response = services.call_public_endpoint('sepomex/estados/')
+        estados_response = services.get_estados()
         estados = estados_response.get('estados', [])
     except services.RedeCoAPIError as exc:
-        error = f"Error al cargar estados: {str(exc)}"
-    
-    if request.method == 'POST':
-        # Recoger datos del formulario
-        nombre = request.POST.get('nombre', '').strip()
-        rfc = request.POST.get('rfc', '').strip().upper()
-        tipo_persona = request.POST.get('tipo_persona', '').strip()
-        estado_id = request.POST.get('estado_id', '').strip()
-        codigo_postal = request.POST.get('codigo_postal', '').strip()
-        municipio_id = request.POST.get('municipio_id', '').strip()
-        colonia_id = request.POST.get('colonia_id', '').strip()
-        localidad = request.POST.get('localidad', '').strip()
-        sexo = request.POST.get('sexo', '').strip()
-        edad = request.POST.get('edad', '').strip()
-        
-        # Nombres para mostrar
-        estado_nombre = request.POST.get('estado_nombre', '').strip()
-        municipio_nombre = request.POST.get('municipio_nombre', '').strip()
-        colonia_nombre = request.POST.get('colonia_nombre', '').strip()
-        
-        # Guardar datos para repoblar formulario en caso de error
-        form_data = {
-            'nombre': nombre,
-            'rfc': rfc,
-            'tipo_persona': tipo_persona,
-            'estado_id': estado_id,
-            'codigo_postal': codigo_postal,
-            'municipio_id': municipio_id,
-            'colonia_id': colonia_id,
-            'localidad': localidad,
-            'sexo': sexo,
-            'edad': edad,
-            'estado_nombre': estado_nombre,
-            'municipio_nombre': municipio_nombre,
-            'colonia_nombre': colonia_nombre,
-        }
-        
-        # Validaciones
-        if not all([nombre, rfc, tipo_persona, estado_id, codigo_postal]):
-            error = 'Los campos marcados con * son obligatorios.'
-        elif Cliente.objects.filter(rfc=rfc).exists():
-            error = f'Ya existe un cliente con el RFC {rfc}.'
-        else:
-            try:
-                cliente = Cliente(
-                    nombre=nombre,
-                    rfc=rfc,
-                    tipo_persona=int(tipo_persona),
-                    estado_id=int(estado_id),
-                    estado_nombre=estado_nombre,
-                    codigo_postal=codigo_postal,
-                    municipio_id=int(municipio_id) if municipio_id else None,
-                    municipio_nombre=municipio_nombre,
-                    colonia_id=int(colonia_id) if colonia_id else None,
-                    colonia_nombre=colonia_nombre,
-                    localidad=localidad,
-                    sexo=sexo if sexo else None,
-                    edad=int(edad) if edad else None,
-                )
-                cliente.full_clean()  # Ejecutar validaciones del modelo
-                cliente.save()
-                request.session['create_success'] = f'Cliente {nombre} creado exitosamente.'
-                return redirect('redeco_frontend:clientes_list')
-            except Exception as e:
-                error = f'Error al crear cliente: {str(e)}'
+        error = error or f"Error al cargar estados: {exc}"
     
     context = {
         'error': error,
         'success': success,
         'estados': estados,
         'form': form_data,
+        'field_errors': field_errors,
+        'idem': uuid4().hex,
     }
     return render(request, 'clientes_form.html', context)
 
@@ -1093,86 +1079,140 @@ def clientes_create(request):
 @require_http_methods(['GET', 'POST'])
 @require_token
 def clientes_edit(request, cliente_id):
-    """Editar un cliente existente."""
-    cliente = get_object_or_404(Cliente, id=cliente_id)
-    token = request.session.get('redeco_token')
+    """Editar un cliente existente.
+
+    El POST válido se guarda con un solo UPDATE, sin cargar antes el cliente.
+    Si el POST falla, el formulario muestra lo enviado (no la fila de la BD),
+    y un cliente inexistente da 404.
+    """
+    token = request.redeco_token
     error = None
+    field_errors = {}
     success = None
+    updated = None
+    
+    if request.method == 'POST':
+        idem_key = _cliente_idem_key(request)
+        # La clave se reclama antes de guardar (cache.add es atómico)
+        if idem_key and not cache.add(idem_key, 1, CLIENTE_IDEM_TIMEOUT):
+            # Reenvío de un formulario que ya se guardó o se está guardando
+            return redirect('redeco_frontend:clientes_list')
+        
+        # Recoger datos del formulario
+        form = _cliente_form(request.POST)
+        nombre, rfc = form['nombre'], form['rfc']
+        
+        try:
+            # Validaciones
+            if not all(form[f] for f in _CLIENTE_REQUIRED_FIELDS):
+                error = 'Los campos marcados con * son obligatorios.'
+            else:
+                try:
+                    values = _cliente_values(form)
+                    # Validar con una instancia sin guardar (no consulta el cliente);
+                    # el RFC duplicado lo detecta el índice único al guardar
+                    Cliente(pk=cliente_id, **values).full_clean(validate_unique=False)
+                    with transaction.atomic():
+                        # update() no aplica auto_now, por eso updated_at va explícito
+                        updated = Cliente.objects.filter(pk=cliente_id).update(**values, updated_at=timezone.now())
+                except IntegrityError:
+                    error = f'Ya existe otro cliente con el RFC {rfc}.'
+                    field_errors = {'rfc': [error]}
+                except ValidationError as e:
+                    error, field_errors = _cliente_errors(e)
+        finally:
+            if idem_key and not updated:
+                # No se guardó: liberar la clave para poder reenviar el formulario
+                cache.delete(idem_key)
+        if updated:
+            messages.success(request, f'Cliente {nombre} actualizado exitosamente.')
+            return redirect('redeco_frontend:clientes_list')
+    
+    # Cargar catálogos sólo si se va a mostrar el formulario (no tras guardar);
+    # estados se pide en paralelo con la lectura del cliente
+    estados_future = services.submit(services.get_estados)
+    if request.method == 'POST':
+        # El POST no se guardó: 404 si el cliente no existe; si existe, se
+        # vuelve a mostrar lo enviado
+        if not Cliente.objects.filter(pk=cliente_id).exists():
+            raise Http404('No existe el cliente.')
+        cliente = _cliente_from_form(form, pk=cliente_id)
+    else:
+        cliente = get_object_or_404(Cliente, id=cliente_id)
     
-    # Cargar catálogos necesarios
     estados = []
     try:
-        estados_response = services.call_public_endpoint('sepomex/estados/')
+        estados_response = estados_future.result()
         estados = estados_response.get('estados', [])
     except services.RedeCoAPIError as exc:
-        error = f"Error al cargar estados: {str(exc)}"
-    
-    if request.method == 'POST':
-        # Recoger datos del formulario
-        nombre = request.POST.get('nombre', '').strip()
-        rfc = request.POST.get('rfc', '').strip().upper()
-        tipo_persona = request.POST.get('tipo_persona', '').strip()
-        estado_id = request.POST.get('estado_id', '').strip()
-        codigo_postal = request.POST.get('codigo_postal', '').strip()
-        municipio_id = request.POST.get('municipio_id', '').strip()
-        colonia_id = request.POST.get('colonia_id', '').strip()
-        localidad = request.POST.get('localidad', '').strip()
-        sexo = request.POST.get('sexo', '').strip()
-        edad = request.POST.get('edad', '').strip()
-        
-        # Nombres para mostrar
-        estado_nombre = request.POST.get('estado_nombre', '').strip()
-        municipio_nombre = request.POST.get('municipio_nombre', '').strip()
-        colonia_nombre = request.POST.get('colonia_nombre', '').strip()
-        
-        # Validaciones
-        if not all([nombre, rfc, tipo_persona, estado_id, codigo_postal]):
-            error = 'Los campos marcados con * son obligatorios.'
-        elif Cliente.objects.filter(rfc=rfc).exclude(id=cliente_id).exists():
-            error = f'Ya existe otro cliente con el RFC {rfc}.'
-        else:
-            try:
-                cliente.nombre = nombre
-                cliente.rfc = rfc
-                cliente.tipo_persona = int(tipo_persona)
-                cliente.estado_id = int(estado_id)
-                cliente.estado_nombre = estado_nombre
-                cliente.codigo_postal = codigo_postal
-                cliente.municipio_id = int(municipio_id) if municipio_id else None
-                cliente.municipio_nombre = municipio_nombre
-                cliente.colonia_id = int(colonia_id) if colonia_id else None
-                cliente.colonia_nombre = colonia_nombre
-                cliente.localidad = localidad
-                cliente.sexo = sexo if sexo else None
-                cliente.edad = int(edad) if edad else None
-                
-                cliente.full_clean()  # Ejecutar validaciones del modelo
-                cliente.save()
-                request.session['update_success'] = f'Cliente {nombre} actualizado exitosamente.'
-                return redirect('redeco_frontend:clientes_list')
-            except Exception as e:
-                error = f'Error al actualizar cliente: {str(e)}'
+        error = error or f"Error al cargar estados: {exc}"
     
     context = {
         'error': error,
         'success': success,
         'estados': estados,
         'cliente': cliente,
+        'field_errors': field_errors,
         'edit_mode': True,
+        'idem': uuid4().hex,
     }
     return render(request, 'clientes_form.html', context)
 
 
+@require_http_methods(['POST'])
+@require_token
+def clientes_import(request):
+    """Importar clientes desde un CSV cuyos encabezados son los campos del formulario.
+
+    Las filas válidas se insertan por lotes con services.bulk_create_clientes;
+    las de un RFC ya registrado (o repetido en el archivo) se omiten y las
+    inválidas se reportan por número de fila.
+    """
+    archivo = request.FILES.get('archivo')
+    if not archivo:
+        messages.error(request, 'Selecciona un archivo CSV para importar.')
+        return redirect('redeco_frontend:clientes_list')
+    
+    clientes = []
+    invalidas = []
+    try:
+        rows = csv.DictReader(io.TextIOWrapper(archivo, encoding='utf-8-sig'))
+        for num, row in enumerate(rows, start=2):  # la fila 1 es el encabezado
+            form = _cliente_form(row)
+            if not all(form[f] for f in _CLIENTE_REQUIRED_FIELDS):
+                invalidas.append(num)
+                continue
+            try:
+                clientes.append(_build_cliente(form))
+            except ValidationError:
+                invalidas.append(num)
+    except (UnicodeDecodeError, csv.Error) as e:
+        messages.error(request, f'No se pudo leer el CSV: {e}')
+        return redirect('redeco_frontend:clientes_list')
+    
+    creados, duplicados = services.bulk_create_clientes(clientes)
+    mensaje = f'{creados} clientes importados'
+    if duplicados:
+        mensaje += f', {duplicados} con RFC ya registrado'
+    if invalidas:
+        mensaje += f', {len(invalidas)} filas inválidas ({", ".join(map(str, invalidas[:10]))}'
+        mensaje += ', ...)' if len(invalidas) > 10 else ')'
+    messages.success(request, mensaje + '.')
+    return redirect('redeco_frontend:clientes_list')
+
+
 @require_http_methods(['POST'])
 @require_token
 def clientes_delete(request, cliente_id):
     """Eliminar un cliente."""
-    cliente = get_object_or_404(Cliente, id=cliente_id)
-    nombre = cliente.nombre
+    # Sólo se necesita el nombre para el mensaje, no la fila completa
+    nombre = Cliente.objects.filter(id=cliente_id).values_list('nombre', flat=True).first()
+    if nombre is None:
+        raise Http404('No existe el cliente.')
     try:
-        cliente.delete()
-        request.session['delete_success'] = f'Cliente {nombre} eliminado exitosamente.'
+        Cliente.objects.filter(id=cliente_id).delete()
+        messages.success(request, f'Cliente {nombre} eliminado exitosamente.')
     except Exception as e:
-        request.session['delete_error'] = f'Error al eliminar cliente: {str(e)}'
+        messages.error(request, f'Error al eliminar cliente: {e}')
     
     return redirect('redeco_frontend:clientes_list')